@@ -1,3 +1,4 @@
+import asyncio
 import json
 from dataclasses import dataclass
 from typing import Any, cast
@@ -6,6 +7,9 @@ from aiohttp.client import ClientSession
 
 JSON = dict[str, Any]
 
+# Statuses the server answers with when it is briefly overloaded.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
 
 @dataclass
 class Builder:
@@ -26,11 +30,21 @@ class BuildBotAPI:
         self._session = session
 
     async def authenticate(self, token: str) -> None:
-        await self._session.get(
+        # Release the response straight away so that its connection goes back
+        # to the pool for the API requests that follow.
+        async with self._session.get(
             "https://buildbot.python.org/all/auth/login", params={"token": token}
-        )
+        ):
+            pass
 
-    async def _fetch_text(self, url: str) -> str:
+    async def _fetch_text(self, url: str, retries: int = 3) -> str:
+        delay = 0.5
+        for _ in range(retries):
+            async with self._session.get(url) as resp:
+                if resp.status not in RETRY_STATUSES:
+                    return await resp.text()
+            await asyncio.sleep(delay)
+            delay *= 2
         async with self._session.get(url) as resp:
             return await resp.text()
 
@@ -40,13 +40,15 @@ tag_cre = re.compile(r"(\d+)(?:\.(\d+)(?:\.(\d+))?)?(?:([ab]|rc)(\d+))?$")
 class ReleaseShelf(Protocol):
     def close(self) -> None: ...
 
+    def clear(self) -> None: ...
+
     @overload
     def get(self, key: Literal["finished"], default: bool | None = None) -> bool: ...
 
     @overload
     def get(
-        self, key: Literal["completed_tasks"], default: list[Task] | None = None
-    ) -> list[Task]: ...
+        self, key: Literal["completed_tasks"], default: int | None = None
+    ) -> int: ...
 
     @overload
     def get(self, key: Literal["gpg_key"], default: str | None = None) -> str: ...
@@ -66,11 +68,16 @@ class ReleaseShelf(Protocol):
     @overload
     def get(self, key: Literal["release"], default: Tag | None = None) -> Tag: ...
 
+    @overload
+    def get(
+        self, key: Literal["purged_urls"], default: list[str] | None = None
+    ) -> list[str]: ...
+
     @overload
     def __getitem__(self, key: Literal["finished"]) -> bool: ...
 
     @overload
-    def __getitem__(self, key: Literal["completed_tasks"]) -> list[Task]: ...
+    def __getitem__(self, key: Literal["completed_tasks"]) -> int: ...
 
     @overload
     def __getitem__(self, key: Literal["gpg_key"]) -> str: ...
@@ -90,13 +97,14 @@ class ReleaseShelf(Protocol):
     @overload
     def __getitem__(self, key: Literal["release"]) -> Tag: ...
 
+    @overload
+    def __getitem__(self, key: Literal["purged_urls"]) -> list[str]: ...
+
     @overload
     def __setitem__(self, key: Literal["finished"], value: bool) -> None: ...
 
     @overload
-    def __setitem__(
-        self, key: Literal["completed_tasks"], value: list[Task]
-    ) -> None: ...
+    def __setitem__(self, key: Literal["completed_tasks"], value: int) -> None: ...
 
     @overload
     def __setitem__(self, key: Literal["gpg_key"], value: str) -> None: ...
@@ -116,8 +124,11 @@ class ReleaseShelf(Protocol):
     @overload
     def __setitem__(self, key: Literal["release"], value: Tag) -> None: ...
 
+    @overload
+    def __setitem__(self, key: Literal["purged_urls"], value: list[str]) -> None: ...
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Task:
     function: Callable[[ReleaseShelf], None]
     description: str
@@ -480,6 +491,14 @@ def make_dist(name: str) -> None:
         print(f"created dist directory {name}")
 
 
+def check_xz_version() -> None:
+    """Exit unless xz is recent enough to compress reproducibly with -T0."""
+    version = get_output(["xz", "--version"]).decode()
+    match = re.search(r"(\d+)\.(\d+)", version)
+    if match is None or (int(match[1]), int(match[2])) < (5, 4):
+        error(f"xz 5.4 or later is needed to build the .tar.xz, found: {version}")
+
+
 def tarball(source: str, clamp_mtime: str) -> None:
     """Build tarballs for a directory."""
     print("Making .tgz")
@@ -516,14 +535,18 @@ def tarball(source: str, clamp_mtime: str) -> None:
         ]
     )
     print("Making .tar.xz")
-    run_cmd(["tar", "cJf", xz, *repro_options, source])
+    # From xz 5.4, -T0 always uses the multi-threaded encoder, which splits the
+    # stream into fixed-size blocks, so the output stays the same whatever the
+    # number of cores. Older versions fall back to a single block on one core.
+    check_xz_version()
+    run_cmd(
+        ["tar", "cf", xz, *repro_options, "--use-compress-program", "xz -T0", source]
+    )
     print("Calculating md5 sums")
-    checksum_tgz = hashlib.md5()
     with open(tgz, "rb") as data:
-        checksum_tgz.update(data.read())
-    checksum_xz = hashlib.md5()
+        checksum_tgz = hashlib.file_digest(data, "md5")
     with open(xz, "rb") as data:
-        checksum_xz.update(data.read())
+        checksum_xz = hashlib.file_digest(data, "md5")
     print(f"  {checksum_tgz.hexdigest()}  {os.path.getsize(tgz):8}  {tgz}")
     print(f"  {checksum_xz.hexdigest()}  {os.path.getsize(xz):8}  {xz}")
 
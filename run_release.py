@@ -8,20 +8,33 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import atexit
+import base64
+import concurrent.futures
+import configparser
 import contextlib
+import dbm
 import functools
 import getpass
+import hashlib
 import json
+import multiprocessing
 import os
+import pickle
 import re
 import shelve
+import shlex
 import shutil
+import socket
+import sqlite3
 import subprocess
 import sys
+import tarfile
 import tempfile
+import threading
 import time
-import urllib.request
-from collections.abc import Iterator
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, cast
 
@@ -37,9 +50,17 @@ import update_version_next
 from buildbotapi import BuildBotAPI, Builder
 from release import ReleaseShelf, Tag, Task
 
-API_KEY_REGEXP = re.compile(r"(?P<user>\w+):(?P<key>\w+)")
+API_KEY_REGEXP = re.compile(r"(?P<user>\w+):(?P<key>\w+)", re.ASCII)
 RELEASE_REGEXP = re.compile(
-    r"(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)\.?(?P<extra>.*)?"
+    r"(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)\.?(?P<extra>.*)?", re.ASCII
+)
+GITHUB_HTTPS_OWNER_REGEXP = re.compile(r"(https://)?github\.com/([^/]+)/", re.ASCII)
+GITHUB_SSH_OWNER_REGEXP = re.compile(r"git@github\.com:([^/]+)/", re.ASCII)
+MAGIC_ACTUAL_REGEXP = re.compile(
+    r"^#define\s+PYC_MAGIC_NUMBER\s+(?P<magic>\d+)$", re.MULTILINE
+)
+MAGIC_EXPECTED_REGEXP = re.compile(
+    r"^\s+EXPECTED_MAGIC_NUMBER = (?P<magic>\d+)$", re.MULTILINE
 )
 DOWNLOADS_SERVER = "downloads.nyc1.psf.io"
 DOCS_SERVER = "docs.nyc1.psf.io"
@@ -182,10 +203,105 @@ class ReleaseException(Exception):
     """An error happened in the release process"""
 
 
+def check_legacy_state_file(path: Path) -> None:
+    """Refuse to start while a release is unfinished in the old shelve file.
+
+    Its completed tasks refer to the task list of an older version of these
+    tools, so they cannot be carried over to the current one.
+    """
+    if dbm.whichdb(str(path)) is None:
+        return
+    try:
+        with shelve.open(str(path), "r") as legacy:
+            finished = legacy.get("finished", False)
+    except (*dbm.error, pickle.UnpicklingError):
+        finished = False
+    if not finished:
+        raise ReleaseException(
+            f"An unfinished release was found in {path}, which this version of "
+            "the release tools no longer reads. Finish it with the version it "
+            "was started with, or delete the file to start the release again."
+        )
+
+
+class SqliteShelf:
+    """A shelf keeping pickled values in an SQLite database.
+
+    Every assignment is committed straight away, so the release can be resumed
+    from the last completed task after a crash, unless it is made inside
+    :meth:`transaction`. Values are unpickled once and then served from memory,
+    as this process is the only writer.
+    """
+
+    def __init__(self, path: Path) -> None:
+        # The preflight checks use the shelf from worker threads.
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode this only risks losing the last commits on power loss,
+        # never corrupting the file, and saves a sync on every commit.
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS shelf (key TEXT PRIMARY KEY, value BLOB)"
+        )
+        self._connection.commit()
+        self._cache: dict[str, Any] = {}
+        self._in_transaction = False
+
+    def __getitem__(self, key: str) -> Any:
+        with contextlib.suppress(KeyError):
+            return self._cache[key]
+        row = self._connection.execute(
+            "SELECT value FROM shelf WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        value = self._cache[key] = pickle.loads(row[0])
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO shelf (key, value) VALUES (?, ?)",
+            (key, pickle.dumps(value)),
+        )
+        if not self._in_transaction:
+            self._connection.commit()
+        self._cache[key] = value
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Commit all the assignments made in the block at once."""
+        self._in_transaction = True
+        try:
+            yield
+        except BaseException:
+            self._connection.rollback()
+            self._cache.clear()
+            raise
+        else:
+            self._connection.commit()
+        finally:
+            self._in_transaction = False
+
+    def clear(self) -> None:
+        self._connection.execute("DELETE FROM shelf")
+        if not self._in_transaction:
+            self._connection.commit()
+        self._cache.clear()
+
+    def close(self) -> None:
+        self._connection.close()
+
+
 class ReleaseDriver:
     def __init__(
         self,
-        tasks: list[Task],
+        tasks: Sequence[Task],
         *,
         release_tag: Tag,
         git_repo: str,
@@ -195,30 +311,35 @@ class ReleaseDriver:
         first_state: Task | None = None,
     ) -> None:
         self.tasks = tasks
-        dbfile = Path.home() / ".python_release"
-        self.db: ReleaseShelf = cast(ReleaseShelf, shelve.open(str(dbfile), "c"))
-        if not self.db.get("finished"):
+        check_legacy_state_file(Path.home() / ".python_release")
+        dbfile = Path.home() / ".python_release.sqlite3"
+        shelf = SqliteShelf(dbfile)
+        self.db: ReleaseShelf = cast(ReleaseShelf, shelf)
+        # Record the settings of the release with a single commit.
+        with shelf.transaction():
+            if self.db.get("finished"):
+                # Start afresh after a completed release without reopening the file.
+                self.db.clear()
             self.db["finished"] = False
-        else:
-            self.db.close()
-            self.db = cast(ReleaseShelf, shelve.open(str(dbfile), "n"))
+            if self.db.get("gpg_key"):
+                os.environ["GPG_KEY_FOR_RELEASE"] = self.db["gpg_key"]
+            if not self.db.get("git_repo"):
+                self.db["git_repo"] = Path(git_repo)
+            if not self.db.get("auth_info"):
+                self.db["auth_info"] = api_key
+            if not self.db.get("ssh_user"):
+                self.db["ssh_user"] = ssh_user
+            if not self.db.get("sign_gpg"):
+                self.db["sign_gpg"] = sign_gpg
+            if not self.db.get("release"):
+                self.db["release"] = release_tag
 
         self.current_task: Task | None = first_state
-        self.completed_tasks = self.db.get("completed_tasks", [])
-        self.remaining_tasks = iter(tasks[len(self.completed_tasks) :])
-        if self.db.get("gpg_key"):
-            os.environ["GPG_KEY_FOR_RELEASE"] = self.db["gpg_key"]
-        if not self.db.get("git_repo"):
-            self.db["git_repo"] = Path(git_repo)
-        if not self.db.get("auth_info"):
-            self.db["auth_info"] = api_key
-        if not self.db.get("ssh_user"):
-            self.db["ssh_user"] = ssh_user
-        if not self.db.get("sign_gpg"):
-            self.db["sign_gpg"] = sign_gpg
-
-        if not self.db.get("release"):
-            self.db["release"] = release_tag
+        # Only the number of finished tasks is persisted: the task list is
+        # fixed, so the completed ones are always a prefix of it.
+        completed = self.db.get("completed_tasks", 0)
+        self.completed_tasks = list(tasks[:completed])
+        self.remaining_tasks = iter(tasks[completed:])
 
         print("Release data: ")
         print(f"- Branch: {release_tag.branch}")
@@ -231,7 +352,7 @@ class ReleaseDriver:
         print()
 
     def checkpoint(self) -> None:
-        self.db["completed_tasks"] = self.completed_tasks
+        self.db["completed_tasks"] = len(self.completed_tasks)
 
     def run(self) -> None:
         for task in self.completed_tasks:
@@ -253,6 +374,53 @@ class ReleaseDriver:
         print(f"Congratulations, Python {self.db['release']} is released 🎉🎉🎉")
 
 
+class LockedShelf:
+    """Serialise access to the release shelf from concurrently running tasks."""
+
+    def __init__(self, db: ReleaseShelf) -> None:
+        self._db = db
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            return self._db.get(key, default)
+
+    def __getitem__(self, key: Any) -> Any:
+        with self._lock:
+            return self._db[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._db[key] = value
+
+
+def run_in_parallel(tasks: list[Task], db: ReleaseShelf) -> None:
+    shared_db = cast(ReleaseShelf, LockedShelf(db))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = [executor.submit(task, shared_db) for task in tasks]
+    failures = [
+        (task, error)
+        for task, future in zip(tasks, futures)
+        if (error := future.exception()) is not None
+    ]
+    if failures:
+        # Raise the first failure in task order, like a sequential run would,
+        # but mention the others so they can all be fixed in one go.
+        first_error = failures[0][1]
+        for task, error in failures[1:]:
+            first_error.add_note(f"{task.description} failed: {error}")
+        raise first_error
+
+
+def parallel_tasks(tasks: list[Task], description: str) -> Task:
+    """Group independent tasks into one that runs them concurrently.
+
+    None of the tasks may ask the release manager questions or start
+    interactive programs, as the output of the others would get mixed in.
+    """
+    return Task(functools.partial(run_in_parallel, tasks), description)
+
+
 def ask_question(question: str) -> bool:
     answer = ""
     print(question)
@@ -268,11 +436,106 @@ def ask_question(question: str) -> bool:
 
 
 @contextlib.contextmanager
-def cd(path: Path) -> Iterator[None]:
-    current_path = os.getcwd()
-    os.chdir(path)
-    yield
-    os.chdir(current_path)
+def ssh_control_master() -> Iterator[None]:
+    """Let the git-over-ssh commands of a run share one connection per host."""
+    ssh_command = os.environ.get("GIT_SSH_COMMAND")
+    with tempfile.TemporaryDirectory(prefix="release-ssh-") as control_dir:
+        # %C is a short hash of the connection, which keeps the socket path
+        # below the length limit of UNIX sockets even in long temp dirs.
+        control_path = shlex.quote(f"{control_dir}/%C")
+        os.environ["GIT_SSH_COMMAND"] = (
+            f"{ssh_command or 'ssh'} -o ControlMaster=auto"
+            f" -o ControlPath={control_path} -o ControlPersist=600"
+        )
+        try:
+            yield
+        finally:
+            if ssh_command is None:
+                del os.environ["GIT_SSH_COMMAND"]
+            else:
+                os.environ["GIT_SSH_COMMAND"] = ssh_command
+            for control_socket in Path(control_dir).iterdir():
+                # The host is ignored as the control path is given verbatim.
+                subprocess.run(
+                    [
+                        "ssh",
+                        "-o",
+                        f"ControlPath={control_socket}",
+                        "-O",
+                        "exit",
+                        "master",
+                    ],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+
+
+# Keep git from starting an automatic gc or maintenance run in the middle of
+# the release after it commits, merges or fetches.
+GIT_NO_AUTO_MAINTENANCE = ("-c", "gc.auto=0", "-c", "maintenance.auto=false")
+
+
+def git(repo: Path, *args: str) -> None:
+    """Run a git command against *repo*, raising if it fails."""
+    subprocess.check_call(["git", "-C", str(repo), *GIT_NO_AUTO_MAINTENANCE, *args])
+
+
+def git_output(repo: Path, *args: str) -> str:
+    """Return the stripped output of a read-only git command against *repo*."""
+    # Queries must not take the index lock just to refresh its stat cache.
+    env = {**os.environ, "GIT_OPTIONAL_LOCKS": "0"}
+    return (
+        subprocess.check_output(["git", "-C", str(repo), *args], env=env)
+        .decode()
+        .strip()
+    )
+
+
+def current_branch(repo: Path) -> str | None:
+    """Return the branch checked out in *repo*, or None if HEAD is detached."""
+    # Reading HEAD is enough, no need to start git. In a worktree .git is a
+    # file pointing elsewhere, so ask git then.
+    try:
+        head = (repo / ".git" / "HEAD").read_text()
+    except (FileNotFoundError, NotADirectoryError):
+        head = "ref: " + git_output(repo, "rev-parse", "--symbolic-full-name", "HEAD")
+    prefix = "ref: refs/heads/"
+    return head.strip().removeprefix(prefix) if head.startswith(prefix) else None
+
+
+def checkout(repo: Path, branch: str) -> None:
+    """Check out *branch* in *repo*, unless it already is."""
+    if current_branch(repo) != branch:
+        git(repo, "checkout", branch)
+
+
+# Repositories whose remotes were fetched since the last push in this run.
+_fetched_repos: set[Path] = set()
+
+
+def fetch_all_once(repo: Path) -> None:
+    """Fetch the branches of all the remotes of *repo*, unless already done."""
+    if repo not in _fetched_repos:
+        # The release tag is made locally and nothing after it needs the
+        # other tags, so skip negotiating the thousands of them. Fetch from
+        # several remotes at once rather than one after another.
+        git(repo, "fetch", "--all", "--no-tags", "--jobs=4")
+        _fetched_repos.add(repo)
+
+
+@functools.cache
+def get_commit_sha(repo: Path, ref: str) -> str:
+    """Return the SHA of the commit *ref* points to.
+
+    Only used for release tags, which don't move once created.
+    """
+    # Peel the ref directly instead of starting a history walk.
+    return git_output(repo, "rev-parse", "--verify", f"{ref}^{{commit}}")
+
+
+@functools.cache
+def get_origin_remote_url(repo: Path) -> str:
+    return git_output(repo, "ls-remote", "--get-url", "origin")
 
 
 def check_tool(db: ReleaseShelf, tool: str) -> None:
@@ -288,6 +551,13 @@ check_docker = functools.partial(check_tool, tool="docker")
 
 
 def check_gpg_keys(db: ReleaseShelf) -> None:
+    if not db["sign_gpg"]:
+        # Releases are not signed with GPG from 3.14 on, see PEP 761.
+        return
+    if db.get("gpg_key"):
+        # A key was already chosen for this release before it was interrupted.
+        os.environ["GPG_KEY_FOR_RELEASE"] = db["gpg_key"]
+        return
     pg = gnupg.GPG()
     keys = pg.list_keys(secret=True)
     if not keys:
@@ -308,21 +578,59 @@ def check_gpg_keys(db: ReleaseShelf) -> None:
     os.environ["GPG_KEY_FOR_RELEASE"] = db["gpg_key"]
 
 
+# SSH connections to the PSF servers, shared by all the tasks of a run.
+_ssh_clients: dict[tuple[str, str], paramiko.SSHClient] = {}
+_ssh_clients_locks: dict[tuple[str, str], threading.Lock] = {}
+_ssh_clients_lock = threading.Lock()
+
+
+def get_ssh_client(host: str, user: str) -> paramiko.SSHClient:
+    """Return a connected SSH client for *host*, reusing an open connection."""
+    # Connect to different servers at the same time, but only once to each.
+    with _ssh_clients_lock:
+        lock = _ssh_clients_locks.setdefault((host, user), threading.Lock())
+    with lock:
+        client = _ssh_clients.get((host, user))
+        transport = client.get_transport() if client is not None else None
+        if client is None or transport is None or not transport.is_active():
+            client = paramiko.SSHClient()
+            client.load_system_host_keys()
+            client.set_missing_host_key_policy(paramiko.WarningPolicy)
+            client.connect(host, port=22, username=user)
+            # The connections sit idle while the artifacts are being built,
+            # so keep them from being dropped by firewalls in the meantime.
+            transport = client.get_transport()
+            assert transport is not None, "SSH transport is None"
+            transport.set_keepalive(30)
+            # The uploads are many small SFTP requests, each waiting for its
+            # reply: don't let Nagle's algorithm hold them back.
+            if isinstance(transport.sock, socket.socket):
+                transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            _ssh_clients[host, user] = client
+        return client
+
+
+@atexit.register
+def _close_ssh_clients() -> None:
+    for client in _ssh_clients.values():
+        client.close()
+
+
 def check_ssh_connection(db: ReleaseShelf) -> None:
-    client = paramiko.SSHClient()
-    client.load_system_host_keys()
-    client.set_missing_host_key_policy(paramiko.WarningPolicy)
-    client.connect(DOWNLOADS_SERVER, port=22, username=db["ssh_user"])
-    client.exec_command("pwd")
-    client.connect(DOCS_SERVER, port=22, username=db["ssh_user"])
-    client.exec_command("pwd")
+    # Logging in is the check; the connections are then kept for later tasks.
+    ssh_user = db["ssh_user"]
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        futures = [
+            executor.submit(get_ssh_client, server, ssh_user)
+            for server in (DOWNLOADS_SERVER, DOCS_SERVER)
+        ]
+        # Surface any failure to log in.
+        for future in futures:
+            future.result()
 
 
 def check_sigstore_client(db: ReleaseShelf) -> None:
-    client = paramiko.SSHClient()
-    client.load_system_host_keys()
-    client.set_missing_host_key_policy(paramiko.WarningPolicy)
-    client.connect(DOWNLOADS_SERVER, port=22, username=db["ssh_user"])
+    client = get_ssh_client(DOWNLOADS_SERVER, db["ssh_user"])
     _, stdout, _ = client.exec_command("python3 -m sigstore --version")
     sigstore_version = stdout.read(1000).decode()
     sigstore_vermatch = re.match("^sigstore ([0-9.]+)", sigstore_version)
@@ -344,7 +652,13 @@ def check_buildbots(db: ReleaseShelf) -> None:
                 the_builder
             )
 
-        async with aiohttp.ClientSession() as session:
+        # All requests go to the same host: resolve its name only once, and
+        # keep a few connections alive rather than opening one per builder,
+        # which gets them throttled.
+        connector = aiohttp.TCPConnector(
+            limit_per_host=16, keepalive_timeout=30, ttl_dns_cache=300
+        )
+        async with aiohttp.ClientSession(connector=connector) as session:
             api = BuildBotAPI(session)
             await api.authenticate(token="")
             release_branch = db["release"].branch
@@ -378,21 +692,47 @@ def check_buildbots(db: ReleaseShelf) -> None:
         raise ReleaseException("Buildbots are failing!")
 
 
+# Corresponds to the tag '269' and 'cp311'
+CPYTHON_AUTOCONF_IMAGE = (
+    "quay.io/tiran/cpython_autoconf"
+    "@sha256:f370fee95eefa3d57b00488bce4911635411fa83e2d293ced8cf8a3674ead939"
+)
+# Started by check_docker_running and waited for by run_autoconf.
+_autoconf_image_pull: subprocess.Popen[bytes] | None = None
+
+
 def check_docker_running(db: ReleaseShelf) -> None:
+    global _autoconf_image_pull
     subprocess.check_call(["docker", "container", "ls"])
+    # Older branches run autoconf in a container: download its image while
+    # the other preparation steps run, rather than when autoconf is due.
+    if not (db["git_repo"] / "Tools/build/regen-configure.sh").exists():
+        _autoconf_image_pull = subprocess.Popen(
+            ["docker", "pull", "--quiet", CPYTHON_AUTOCONF_IMAGE],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
 
 
 def run_blurb_release(db: ReleaseShelf) -> None:
     subprocess.check_call(["blurb", "release", str(db["release"])], cwd=db["git_repo"])
-    subprocess.check_call(
-        ["git", "commit", "-m", f"Python {db['release']}"],
-        cwd=db["git_repo"],
-    )
+    git(db["git_repo"], "commit", "-m", f"Python {db['release']}")
 
 
 def check_cpython_repo_is_clean(db: ReleaseShelf) -> None:
-    if subprocess.check_output(["git", "status", "--porcelain"], cwd=db["git_repo"]):
+    # Any output means the tree is dirty, so stop git after the first byte
+    # rather than reading the whole status.
+    args = ["git", "-C", str(db["git_repo"]), "status", "--porcelain", "-z"]
+    env = {**os.environ, "GIT_OPTIONAL_LOCKS": "0"}
+    with subprocess.Popen(args, stdout=subprocess.PIPE, env=env) as status:
+        assert status.stdout is not None
+        dirty = bool(status.stdout.read(1))
+        if dirty:
+            status.terminate()
+    if dirty:
         raise ReleaseException("Git repository is not clean")
+    if status.returncode:
+        raise subprocess.CalledProcessError(status.returncode, args)
 
 
 def check_magic_number(db: ReleaseShelf) -> None:
@@ -416,16 +756,10 @@ def check_magic_number(db: ReleaseShelf) -> None:
 
     work_dir = Path(db["git_repo"])
     magic_actual_file = work_dir / "Include" / "internal" / "pycore_magic_number.h"
-    magic_actual_re = re.compile(
-        r"^#define\s+PYC_MAGIC_NUMBER\s+(?P<magic>\d+)$", re.MULTILINE
-    )
-    magic_actual = get_magic(magic_actual_file, magic_actual_re)
+    magic_actual = get_magic(magic_actual_file, MAGIC_ACTUAL_REGEXP)
 
     magic_expected_file = work_dir / "Lib" / "test" / "test_importlib" / "test_util.py"
-    magic_expected_re = re.compile(
-        r"^\s+EXPECTED_MAGIC_NUMBER = (?P<magic>\d+)$", re.MULTILINE
-    )
-    magic_expected = get_magic(magic_expected_file, magic_expected_re)
+    magic_expected = get_magic(magic_expected_file, MAGIC_EXPECTED_REGEXP)
 
     if magic_actual == magic_expected:
         return
@@ -439,27 +773,27 @@ def check_magic_number(db: ReleaseShelf) -> None:
 
 
 def prepare_temporary_branch(db: ReleaseShelf) -> None:
-    subprocess.check_call(
-        ["git", "checkout", "-b", f"branch-{db['release']}"], cwd=db["git_repo"]
-    )
+    git(db["git_repo"], "checkout", "-b", f"branch-{db['release']}")
 
 
 def remove_temporary_branch(db: ReleaseShelf) -> None:
-    subprocess.check_call(
-        ["git", "branch", "-D", f"branch-{db['release']}"], cwd=db["git_repo"]
-    )
+    git(db["git_repo"], "branch", "-D", f"branch-{db['release']}")
 
 
 def prepare_pydoc_topics(db: ReleaseShelf) -> None:
+    # Like bump_version, the new topics are folded into the release commit by
+    # the amend at the end of bump_version_in_docs.
     subprocess.check_call(["make", "venv"], cwd=db["git_repo"] / "Doc")
     subprocess.check_call(["make", "pydoc-topics"], cwd=db["git_repo"] / "Doc")
-    shutil.copy2(
-        db["git_repo"] / "Doc" / "build" / "pydoc-topics" / "topics.py",
-        db["git_repo"] / "Lib" / "pydoc_data" / "topics.py",
-    )
-    subprocess.check_call(
-        ["git", "commit", "-a", "--amend", "--no-edit"], cwd=db["git_repo"]
-    )
+    source = db["git_repo"] / "Doc" / "build" / "pydoc-topics" / "topics.py"
+    destination = db["git_repo"] / "Lib" / "pydoc_data" / "topics.py"
+    # Both files live in the same checkout, so a hardlink avoids rewriting
+    # the file; fall back to copying if the filesystem refuses.
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
 
 
 def run_autoconf(db: ReleaseShelf) -> None:
@@ -473,98 +807,126 @@ def run_autoconf(db: ReleaseShelf) -> None:
     # Python 3.11 and prior rely on autoconf built within a container
     # in order to maintain stability of autoconf generation.
     else:
-        # Corresponds to the tag '269' and 'cp311'
-        cpython_autoconf_sha256 = (
-            "f370fee95eefa3d57b00488bce4911635411fa83e2d293ced8cf8a3674ead939"
-        )
+        # The image is pinned by digest, so one downloaded in the background
+        # can be used as is. If that failed, or the release was resumed in
+        # another process, docker pulls it here instead.
+        if _autoconf_image_pull is not None:
+            _autoconf_image_pull.wait()
         subprocess.check_call(
             [
                 "docker",
                 "run",
                 "--rm",
-                "--pull=always",
+                "--pull=missing",
                 f"-v{db['git_repo']}:/src",
-                f"quay.io/tiran/cpython_autoconf@sha256:{cpython_autoconf_sha256}",
+                CPYTHON_AUTOCONF_IMAGE,
             ],
             cwd=db["git_repo"],
         )
         subprocess.check_call(["docker", "rmi", "quay.io/tiran/cpython_autoconf", "-f"])
 
-    subprocess.check_call(
-        ["git", "commit", "-a", "--amend", "--no-edit"], cwd=db["git_repo"]
-    )
+    git(db["git_repo"], "commit", "-a", "--amend", "--no-edit")
 
 
 def check_pyspecific(db: ReleaseShelf) -> None:
-    with open(
-        db["git_repo"] / "Doc" / "tools" / "extensions" / "pyspecific.py"
-    ) as pyspecific:
-        for line in pyspecific:
-            if "SOURCE_URI =" in line:
-                break
+    pyspecific_path = db["git_repo"] / "Doc" / "tools" / "extensions" / "pyspecific.py"
+    contents = pyspecific_path.read_bytes()
+    prefix = b"SOURCE_URI = '"
+    start = contents.find(prefix)
+    end = contents.find(b"'", start + len(prefix)) if start != -1 else -1
+    source_uri = contents[start + len(prefix) : end].decode() if end != -1 else None
+    if source_uri is None:
+        raise ReleaseException(f"SOURCE_URI not found in {pyspecific_path}")
     expected_branch = db["release"].branch
-    expected = (
-        f"SOURCE_URI = 'https://github.com/python/cpython/tree/{expected_branch}/%s'"
-    )
-    if expected != line.strip():
+    expected = f"https://github.com/python/cpython/tree/{expected_branch}/%s"
+    if expected != source_uri:
         raise ReleaseException("SOURCE_URI is incorrect")
 
 
 def bump_version(db: ReleaseShelf) -> None:
-    with cd(db["git_repo"]):
+    # The edits are folded into the release commit by the amend at the end
+    # of bump_version_in_docs, which always runs right after this task.
+    with contextlib.chdir(db["git_repo"]):
         release_mod.bump(db["release"])
-    subprocess.check_call(
-        ["git", "commit", "-a", "--amend", "--no-edit"], cwd=db["git_repo"]
-    )
 
 
 def bump_version_in_docs(db: ReleaseShelf) -> None:
     update_version_next.main([db["release"].doc_version, str(db["git_repo"])])
-    subprocess.check_call(
-        ["git", "commit", "-a", "--amend", "--no-edit"], cwd=db["git_repo"]
-    )
+    git(db["git_repo"], "commit", "-a", "--amend", "--no-edit")
 
 
 def create_tag(db: ReleaseShelf) -> None:
-    with cd(db["git_repo"]):
+    with contextlib.chdir(db["git_repo"]):
         if not release_mod.make_tag(db["release"], sign_gpg=db["sign_gpg"]):
             raise ReleaseException("Error when creating tag")
-    subprocess.check_call(
-        ["git", "commit", "-a", "--amend", "--no-edit"], cwd=db["git_repo"]
-    )
+
+
+@dataclass(frozen=True, slots=True)
+class ReleasePaths:
+    """Where the artifacts of a release are placed in the local checkout."""
+
+    root: Path
+    src: Path
+    docs: Path
+    tgz: Path
+    xz: Path
+    docs_artifacts: tuple[Path, ...]
+
+    @classmethod
+    def from_release(cls, git_repo: Path, tag: Tag) -> ReleasePaths:
+        root = Path(git_repo) / str(tag)
+        src = root / "src"
+        docs = root / "docs"
+        return cls(
+            root=root,
+            src=src,
+            docs=docs,
+            tgz=src / f"Python-{tag}.tgz",
+            xz=src / f"Python-{tag}.tar.xz",
+            docs_artifacts=tuple(
+                docs / f"python-{tag}-docs{suffix}"
+                for suffix in (
+                    ".epub",
+                    "-html.tar.bz2",
+                    "-html.zip",
+                    "-pdf-a4.tar.bz2",
+                    "-pdf-a4.zip",
+                    "-texinfo.tar.bz2",
+                    "-texinfo.zip",
+                    "-text.tar.bz2",
+                    "-text.zip",
+                )
+            ),
+        )
+
+    @property
+    def tarballs(self) -> tuple[Path, Path]:
+        return self.tgz, self.xz
+
+    @property
+    def docs_html_tar_bz2(self) -> Path:
+        return self.docs / f"python-{self.root.name}-docs-html.tar.bz2"
+
+
+def release_paths(db: ReleaseShelf) -> ReleasePaths:
+    return ReleasePaths.from_release(db["git_repo"], db["release"])
 
 
 def wait_for_source_and_docs_artifacts(db: ReleaseShelf) -> None:
     # Determine if we need to wait for docs or only source artifacts.
     release_tag = db["release"]
     should_wait_for_docs = release_tag.includes_docs
+    paths = release_paths(db)
+    release_path = paths.root
 
     # Create the directory so it's easier to place the artifacts there.
-    release_path = Path(db["git_repo"] / str(release_tag))
-    src_path = release_path / "src"
-    src_path.mkdir(parents=True, exist_ok=True)
+    paths.src.mkdir(parents=True, exist_ok=True)
 
     # Build the list of filepaths we're expecting.
-    wait_for_paths = [
-        src_path / f"Python-{release_tag}.tgz",
-        src_path / f"Python-{release_tag}.tar.xz",
-    ]
+    wait_for_paths = list(paths.tarballs)
     if should_wait_for_docs:
-        docs_path = release_path / "docs"
-        docs_path.mkdir(parents=True, exist_ok=True)
-        wait_for_paths.extend(
-            [
-                docs_path / f"python-{release_tag}-docs.epub",
-                docs_path / f"python-{release_tag}-docs-html.tar.bz2",
-                docs_path / f"python-{release_tag}-docs-html.zip",
-                docs_path / f"python-{release_tag}-docs-pdf-a4.tar.bz2",
-                docs_path / f"python-{release_tag}-docs-pdf-a4.zip",
-                docs_path / f"python-{release_tag}-docs-texinfo.tar.bz2",
-                docs_path / f"python-{release_tag}-docs-texinfo.zip",
-                docs_path / f"python-{release_tag}-docs-text.tar.bz2",
-                docs_path / f"python-{release_tag}-docs-text.zip",
-            ]
-        )
+        paths.docs.mkdir(parents=True, exist_ok=True)
+        wait_for_paths.extend(paths.docs_artifacts)
 
     print(
         f"Waiting for source{' and docs' if should_wait_for_docs else ''} artifacts to be built"
@@ -573,7 +935,18 @@ def wait_for_source_and_docs_artifacts(db: ReleaseShelf) -> None:
     for path in wait_for_paths:
         print(f"- '{os.path.relpath(path, release_path)}'")
 
-    while not all(path.exists() for path in wait_for_paths):
+    # List each artifacts directory once per second rather than looking up
+    # every expected file on its own.
+    missing: dict[Path, set[str]] = {}
+    for path in wait_for_paths:
+        missing.setdefault(path.parent, set()).add(path.name)
+    while True:
+        for directory, names in missing.items():
+            with os.scandir(directory) as entries:
+                names.difference_update(entry.name for entry in entries)
+        missing = {directory: names for directory, names in missing.items() if names}
+        if not missing:
+            break
         time.sleep(1)
 
 
@@ -584,58 +957,124 @@ def check_doc_unreleased_version(db: ReleaseShelf) -> None:
     # didn't do its job.
     # But, there could also be a false positive.
     release_tag = db["release"]
-    docs_path = Path(db["git_repo"]) / str(release_tag) / "docs"
-    archive_path = docs_path / f"python-{release_tag}-docs-html.tar.bz2"
+    archive_path = release_paths(db).docs_html_tar_bz2
     if release_tag.includes_docs:
         assert archive_path.exists()
     if archive_path.exists():
-        with tempfile.TemporaryDirectory() as temp_dir:
-            subprocess.run(["tar", "-xjf", archive_path, "-C", temp_dir])
-            proc = subprocess.run(["grep", "-rHn", "[(]unreleased[)]", temp_dir])
-            if proc.returncode == 0:
-                if not ask_question(
-                    "Are these `(unreleased)` strings in built docs OK?"
-                ):
-                    raise AssertionError("`(unreleased)` strings found in docs")
+        # Stream the members out of the decompressor instead of extracting
+        # thousands of files to disk only to read them back.
+        # Prefer a multi-threaded bzip2 when one is installed.
+        decompressor = shutil.which("lbzip2") or shutil.which("pbzip2") or "bzip2"
+        found = False
+        with subprocess.Popen(
+            [decompressor, "-dc", archive_path], stdout=subprocess.PIPE
+        ) as proc:
+            assert proc.stdout is not None
+            with tarfile.open(fileobj=proc.stdout, mode="r|") as tar:
+                for member in tar:
+                    file = tar.extractfile(member) if member.isfile() else None
+                    if file is None:
+                        continue
+                    content = file.read()
+                    if b"(unreleased)" not in content:
+                        continue
+                    found = True
+                    for lineno, line in enumerate(content.splitlines(), 1):
+                        if b"(unreleased)" in line:
+                            text = line.decode(errors="replace")
+                            print(f"{member.name}:{lineno}:{text}")
+            # Drain the end-of-archive padding so the decompressor exits cleanly.
+            proc.stdout.read()
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+        if found:
+            if not ask_question("Are these `(unreleased)` strings in built docs OK?"):
+                raise AssertionError("`(unreleased)` strings found in docs")
+
+
+_sigstore_token: str | None = None
+
+
+def get_sigstore_token() -> str:
+    """Return a Sigstore identity token, reusing the last one while it is valid.
+
+    Getting a new one means going through the OAuth flow in a browser. The
+    token is a bearer credential, so it is only kept in memory.
+    """
+    global _sigstore_token
+    if _sigstore_token is not None:
+        try:
+            payload = _sigstore_token.split(".")[1]
+            claims = json.loads(
+                base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+            )
+            expires = claims["exp"]
+        except (IndexError, KeyError, ValueError):
+            # Not a token we can read, so get a new one.
+            expires = 0
+        # Leave enough time for the token to be used.
+        if expires - time.time() > 60:
+            return _sigstore_token
+    issuer = sigstore.oidc.Issuer(sigstore.oidc.DEFAULT_OAUTH_ISSUER_URL)
+    _sigstore_token = str(issuer.identity_token())
+    return _sigstore_token
 
 
 def sign_source_artifacts(db: ReleaseShelf) -> None:
-    print("Signing tarballs with GPG")
+    if not db["sign_gpg"]:
+        return
     uid = os.environ.get("GPG_KEY_FOR_RELEASE")
     if not uid:
         print("List of available private keys:")
         subprocess.check_call('gpg -K | grep -A 1 "^sec"', shell=True)
         uid = input("Please enter key ID to use for signing: ")
 
-    tarballs_path = Path(db["git_repo"] / str(db["release"]) / "src")
-    tgz = str(tarballs_path / f"Python-{db['release']}.tgz")
-    xz = str(tarballs_path / f"Python-{db['release']}.tar.xz")
+    tgz, xz = map(str, release_paths(db).tarballs)
 
-    subprocess.check_call(["gpg", "-bas", "-u", uid, tgz])
-    subprocess.check_call(["gpg", "-bas", "-u", uid, xz])
+    # Unlock the key once with a throwaway signature, so that the agent has it
+    # cached and both tarballs can be signed at the same time without racing
+    # for the passphrase.
+    subprocess.run(
+        ["gpg", "--yes", "--sign", "-u", uid, "--output", os.devnull],
+        stdin=subprocess.DEVNULL,
+        check=True,
+    )
+    # Passed through the environment to keep it out of the process list.
+    env = {**os.environ, "SIGSTORE_IDENTITY_TOKEN": get_sigstore_token()}
 
-    print("Signing tarballs with Sigstore")
+    print("Signing tarballs with GPG and Sigstore")
+    # The four signatures are independent, and Sigstore spends most of its
+    # time waiting on the network, so run them all at the same time.
+    signers = [subprocess.Popen(["gpg", "-bas", "-u", uid, path]) for path in (tgz, xz)]
     for filename in (tgz, xz):
         cert_file = filename + ".crt"
         sig_file = filename + ".sig"
         bundle_file = filename + ".sigstore"
 
-        subprocess.check_call(
-            [
-                "python3",
-                "-m",
-                "sigstore",
-                "sign",
-                "--oidc-disable-ambient-providers",
-                "--signature",
-                sig_file,
-                "--certificate",
-                cert_file,
-                "--bundle",
-                bundle_file,
-                filename,
-            ]
+        signers.append(
+            subprocess.Popen(
+                [
+                    "python3",
+                    "-m",
+                    "sigstore",
+                    "sign",
+                    "--oidc-disable-ambient-providers",
+                    "--signature",
+                    sig_file,
+                    "--certificate",
+                    cert_file,
+                    "--bundle",
+                    bundle_file,
+                    filename,
+                ],
+                env=env,
+            )
         )
+    # Wait for every signer before failing, so none is left running.
+    returncodes = [signer.wait() for signer in signers]
+    for signer, returncode in zip(signers, returncodes):
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, signer.args)
 
 
 def build_sbom_artifacts(db: ReleaseShelf) -> None:
@@ -645,35 +1084,138 @@ def build_sbom_artifacts(db: ReleaseShelf) -> None:
         print("Skipping building an SBOM, missing 'Misc/sbom.spdx.json'")
         return
 
-    release_version = db["release"]
-    # For each source tarball build an SBOM.
-    for ext in (".tgz", ".tar.xz"):
-        tarball_name = f"Python-{release_version}{ext}"
-        tarball_path = str(db["git_repo"] / str(db["release"]) / "src" / tarball_name)
-
-        print(f"Building an SBOM for artifact '{tarball_name}'")
-        sbom_data = sbom.create_sbom_for_source_tarball(tarball_path)
-
-        with open(tarball_path + ".spdx.json", mode="w") as f:
-            f.write(json.dumps(sbom_data, indent=2, sort_keys=True))
+    tarball_paths = []
+    for tarball in release_paths(db).tarballs:
+        tarball_paths.append(str(tarball))
+        print(f"Building an SBOM for artifact '{tarball.name}'")
+    checksums = [file_sha256(tarball_path) for tarball_path in tarball_paths]
+
+    # Decompressing and hashing every member of a tarball is CPU bound, so
+    # build the SBOMs of the two tarballs in separate processes. By now this
+    # process runs paramiko's SSH threads, which makes forking it unsafe.
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=2, mp_context=multiprocessing.get_context("forkserver")
+    ) as executor:
+        sboms = executor.map(
+            sbom.create_sbom_for_source_tarball, tarball_paths, checksums
+        )
+        for tarball_path, sbom_data in zip(tarball_paths, sboms):
+            with open(tarball_path + ".spdx.json", mode="w") as f:
+                f.write(json.dumps(sbom_data, indent=2, sort_keys=True))
 
 
 class MySFTPClient(paramiko.SFTPClient):
     def put_dir(
-        self, source: str | Path, target: str | Path, progress: Any = None
+        self,
+        source: str | Path,
+        target: str | Path,
+        progress: Any = None,
+        workers: int = 4,
     ) -> None:
-        for item in os.listdir(source):
-            if os.path.isfile(os.path.join(source, item)):
-                progress.text(item)
-                self.put(os.path.join(source, item), f"{target}/{item}")
-                progress()
-            else:
-                self.mkdir(f"{target}/{item}", ignore_existing=True)
-                self.put_dir(
-                    os.path.join(source, item),
-                    f"{target}/{item}",
-                    progress=progress,
-                )
+        self.put_tree(*walk_tree(source, target), progress=progress, workers=workers)
+
+    def put_tree(
+        self,
+        directories: list[str],
+        files: list[tuple[str, str]],
+        progress: Any = None,
+        workers: int = 4,
+    ) -> None:
+        """Upload a tree listed by walk_tree(), whose root is *directories[0]*."""
+        target = directories[0]
+        # Create the whole remote tree up front with a single command rather
+        # than paying a round-trip per directory while uploading.
+        self.mkdirs(directories)
+        # Files already uploaded by an earlier, interrupted attempt are only
+        # sent again if their content changed. Leftovers, including partial
+        # uploads, are removed.
+        remote_digests = self.sha256sums(target)
+        if stale := remote_digests.keys() - {remote for _, remote in files}:
+            self.execute("rm -f " + " ".join(map(shlex.quote, sorted(stale))))
+
+        # Upload over several SFTP sessions on the same connection, so that
+        # the round-trips of one file overlap with the transfer of others.
+        pending = iter(files)
+        lock = threading.Lock()
+        # Redrawing the progress bar for each of the thousands of files in the
+        # docs costs more than uploading the small ones, so report in batches.
+        unreported = 0
+        last_report = time.monotonic()
+
+        def upload(client: MySFTPClient) -> None:
+            nonlocal unreported, last_report
+            while True:
+                with lock:
+                    item = next(pending, None)
+                if item is None:
+                    return
+                local_path, remote_path = item
+                # Only hash the local file if there is a remote copy to compare.
+                remote_digest = remote_digests.get(remote_path)
+                if remote_digest is None or remote_digest != file_sha256(local_path):
+                    # The files are hard-linked into the public download folder
+                    # once placed, so never rewrite one in place: upload a new
+                    # file and rename it over the old one.
+                    partial_path = remote_path + ".part"
+                    client.put(local_path, partial_path)
+                    client.posix_rename(partial_path, remote_path)
+                if progress is not None:
+                    with lock:
+                        unreported += 1
+                        now = time.monotonic()
+                        if unreported >= 50 or now - last_report >= 0.1:
+                            progress.text(os.path.basename(local_path))
+                            progress(unreported)
+                            unreported, last_report = 0, now
+
+        clients = [self]
+        try:
+            clients += [self.clone() for _ in range(min(workers, len(files)) - 1)]
+            with concurrent.futures.ThreadPoolExecutor(len(clients)) as executor:
+                for future in [executor.submit(upload, c) for c in clients]:
+                    future.result()
+            if progress is not None and unreported:
+                progress(unreported)
+        finally:
+            for client in clients[1:]:
+                client.close()
+
+    def clone(self) -> MySFTPClient:
+        """Open another SFTP session over the same SSH connection."""
+        channel = self.get_channel()
+        assert channel is not None, "SFTP client has no channel"
+        client = MySFTPClient.from_transport(channel.get_transport())
+        assert client is not None, "Could not open another SFTP session"
+        return client
+
+    def execute(self, command: str) -> bytes:
+        """Run *command* on the server over this connection and return its output."""
+        channel = self.get_channel()
+        assert channel is not None, "SFTP client has no channel"
+        session = channel.get_transport().open_session()
+        session.exec_command(command)
+        stdout = session.makefile("rb").read()
+        if session.recv_exit_status() != 0:
+            raise ReleaseException(session.recv_stderr(1000))
+        return stdout
+
+    def mkdirs(self, paths: list[str]) -> None:
+        """Create all *paths*, including parents, with one remote command."""
+        self.execute("mkdir -p " + " ".join(map(shlex.quote, paths)))
+
+    def sha256sums(self, path: str) -> dict[str, str]:
+        """Return the SHA-256 digests of the files below *path* on the server."""
+        # With -z the entries end in NUL and the names are not escaped, so
+        # names with newlines or backslashes come back as they are.
+        output = self.execute(
+            f"find {shlex.quote(path)} -type f -exec sha256sum -z {{}} +"
+        )
+        digests = {}
+        for entry in output.decode().split("\0"):
+            if entry:
+                digest, _, filename = entry.partition("  ")
+                digests[filename] = digest
+        return digests
 
     def mkdir(
         self, path: bytes | str, mode: int = 511, ignore_existing: bool = False
@@ -687,11 +1229,57 @@ class MySFTPClient(paramiko.SFTPClient):
                 raise
 
 
-def upload_files_to_server(db: ReleaseShelf, server: str) -> None:
-    client = paramiko.SSHClient()
-    client.load_system_host_keys()
-    client.set_missing_host_key_policy(paramiko.WarningPolicy)
-    client.connect(server, port=22, username=db["ssh_user"])
+def file_sha256(path: str | Path) -> str:
+    """Return the SHA-256 of a local file, hashing each version of it once.
+
+    The SBOM and the uploads both need the digests of the same artifacts.
+    """
+    stat = os.stat(path)
+    return _file_sha256(os.fspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+@functools.cache
+def _file_sha256(path: str, size: int, mtime_ns: int) -> str:
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def walk_tree(
+    source: str | Path, target: str | Path
+) -> tuple[list[str], list[tuple[str, str]]]:
+    """List what uploading *source* to *target* involves.
+
+    Return the remote directories to create, starting with *target*, and the
+    (local path, remote path) pairs of the files to upload.
+    """
+    directories = [str(target)]
+    files = []
+    # Build the remote paths while descending instead of deriving each one
+    # from the local path, which costs a relpath() and normpath() per file.
+    pending = [(os.fspath(source), str(target))]
+    while pending:
+        local_dir, remote_dir = pending.pop()
+        with os.scandir(local_dir) as entries:
+            for entry in entries:
+                remote_path = f"{remote_dir}/{entry.name}"
+                if entry.is_dir():
+                    directories.append(remote_path)
+                    # Like os.walk(), don't descend into symlinked directories.
+                    if not entry.is_symlink():
+                        pending.append((entry.path, remote_path))
+                else:
+                    files.append((entry.path, remote_path))
+    return directories, files
+
+
+# Uploads started ahead of their own task, keyed by server.
+background_uploads: dict[str, concurrent.futures.Future[None]] = {}
+
+
+def upload_files_to_server(
+    db: ReleaseShelf, server: str, show_progress: bool = True
+) -> None:
+    client = get_ssh_client(server, db["ssh_user"])
     transport = client.get_transport()
     assert transport is not None, f"SSH transport to {server} is None"
 
@@ -699,24 +1287,20 @@ def upload_files_to_server(db: ReleaseShelf, server: str) -> None:
     ftp_client = MySFTPClient.from_transport(transport)
     assert ftp_client is not None, f"SFTP client to {server} is None"
 
-    client.exec_command(f"rm -rf {destination}")
-
     with contextlib.suppress(OSError):
         ftp_client.mkdir(str(destination))
 
-    artifacts_path = Path(db["git_repo"] / str(db["release"]))
+    artifacts_path = release_paths(db).root
 
     shutil.rmtree(artifacts_path / f"Python-{db['release']}", ignore_errors=True)
 
     def upload_subdir(subdir: str) -> None:
-        with contextlib.suppress(OSError):
-            ftp_client.mkdir(str(destination / subdir))
-        with alive_bar(len(tuple((artifacts_path / subdir).glob("**/*")))) as progress:
-            ftp_client.put_dir(
-                artifacts_path / subdir,
-                str(destination / subdir),
-                progress=progress,
-            )
+        # Walk the tree once, both for the size of the progress bar and for
+        # the upload itself.
+        directories, files = walk_tree(artifacts_path / subdir, destination / subdir)
+        bar = alive_bar(len(files)) if show_progress else contextlib.nullcontext()
+        with bar as progress:
+            ftp_client.put_tree(directories, files, progress=progress)
 
     if server == DOCS_SERVER:
         upload_subdir("docs")
@@ -729,46 +1313,67 @@ def upload_files_to_server(db: ReleaseShelf, server: str) -> None:
 
 
 def upload_files_to_downloads_server(db: ReleaseShelf) -> None:
+    release_tag: release_mod.Tag = db["release"]
+    if release_tag.is_final or release_tag.is_release_candidate:
+        # The docs server upload does not depend on this one, so run it in the
+        # background meanwhile. It gets its own copy of the values it needs
+        # rather than sharing the shelf across threads.
+        docs_db = {key: db[key] for key in ("ssh_user", "release", "git_repo")}
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        background_uploads[DOCS_SERVER] = executor.submit(
+            upload_files_to_server,
+            cast(ReleaseShelf, docs_db),
+            DOCS_SERVER,
+            show_progress=False,
+        )
+        executor.shutdown(wait=False)
     upload_files_to_server(db, DOWNLOADS_SERVER)
 
 
-def place_files_in_download_folder(db: ReleaseShelf) -> None:
-    client = paramiko.SSHClient()
-    client.load_system_host_keys()
-    client.set_missing_host_key_policy(paramiko.WarningPolicy)
-    client.connect(DOWNLOADS_SERVER, port=22, username=db["ssh_user"])
+def execute_commands(client: paramiko.SSHClient, commands: list[str]) -> None:
+    """Run *commands* in order in one remote shell, stopping at the first failure.
+
+    Using a single session saves a round-trip to the server per command.
+    """
     transport = client.get_transport()
-    assert transport is not None, f"SSH transport to {DOWNLOADS_SERVER} is None"
+    assert transport is not None, "SSH transport is None"
+    channel = transport.open_session()
+    channel.exec_command("set -e; " + "; ".join(commands))
+    if channel.recv_exit_status() != 0:
+        raise ReleaseException(channel.recv_stderr(1000))
 
-    # Sources
 
-    source = f"/home/psf-users/{db['ssh_user']}/{db['release']}"
-    destination = f"/srv/www.python.org/ftp/python/{db['release'].normalized()}"
+def place_files_in_download_folder(db: ReleaseShelf) -> None:
+    release_tag: release_mod.Tag = db["release"]
+    client = get_ssh_client(DOWNLOADS_SERVER, db["ssh_user"])
+    source = f"/home/psf-users/{db['ssh_user']}/{release_tag}"
 
-    def execute_command(command: str) -> None:
-        channel = transport.open_session()
-        channel.exec_command(command)
-        if channel.recv_exit_status() != 0:
-            raise ReleaseException(channel.recv_stderr(1000))
+    # Sources
 
-    execute_command(f"mkdir -p {destination}")
-    execute_command(f"cp {source}/src/* {destination}")
-    execute_command(f"chgrp downloads {destination}")
-    execute_command(f"chmod 775 {destination}")
-    execute_command(f"find {destination} -type f -exec chmod 664 {{}} \\;")
+    destinations = [
+        (f"{source}/src", f"/srv/www.python.org/ftp/python/{release_tag.normalized()}")
+    ]
 
     # Docs
 
-    release_tag = db["release"]
     if release_tag.is_final or release_tag.is_release_candidate:
-        source = f"/home/psf-users/{db['ssh_user']}/{db['release']}"
-        destination = f"/srv/www.python.org/ftp/python/doc/{release_tag}"
+        destinations.append(
+            (f"{source}/docs", f"/srv/www.python.org/ftp/python/doc/{release_tag}")
+        )
 
-        execute_command(f"mkdir -p {destination}")
-        execute_command(f"cp {source}/docs/* {destination}")
-        execute_command(f"chgrp downloads {destination}")
-        execute_command(f"chmod 775 {destination}")
-        execute_command(f"find {destination} -type f -exec chmod 664 {{}} \\;")
+    # The home directories and /srv are usually on the same filesystem, so try
+    # hard-linking the artifacts into place before falling back to a copy.
+    commands = []
+    for artifacts, destination in destinations:
+        commands += [
+            f"mkdir -p {destination}",
+            f"cp -lf {artifacts}/* {destination} || cp {artifacts}/* {destination}",
+            f"chgrp downloads {destination}",
+            f"chmod 775 {destination}",
+            f"find {destination} -type f -exec chmod 664 {{}} +",
+        ]
+    # Both folders are filled in a single remote shell.
+    execute_commands(client, commands)
 
 
 def upload_docs_to_the_docs_server(db: ReleaseShelf) -> None:
@@ -776,7 +1381,12 @@ def upload_docs_to_the_docs_server(db: ReleaseShelf) -> None:
     if not (release_tag.is_final or release_tag.is_release_candidate):
         return
 
-    upload_files_to_server(db, DOCS_SERVER)
+    docs_upload = background_uploads.pop(DOCS_SERVER, None)
+    if docs_upload is not None:
+        docs_upload.result()
+    else:
+        # Resuming: the background upload did not run in this process.
+        upload_files_to_server(db, DOCS_SERVER)
 
 
 def unpack_docs_in_the_docs_server(db: ReleaseShelf) -> None:
@@ -784,38 +1394,32 @@ def unpack_docs_in_the_docs_server(db: ReleaseShelf) -> None:
     if not (release_tag.is_final or release_tag.is_release_candidate):
         return
 
-    client = paramiko.SSHClient()
-    client.load_system_host_keys()
-    client.set_missing_host_key_policy(paramiko.WarningPolicy)
-    client.connect(DOCS_SERVER, port=22, username=db["ssh_user"])
-    transport = client.get_transport()
-    assert transport is not None, f"SSH transport to {DOCS_SERVER} is None"
+    client = get_ssh_client(DOCS_SERVER, db["ssh_user"])
 
     # Sources
 
-    source = f"/home/psf-users/{db['ssh_user']}/{db['release']}"
+    source = f"/home/psf-users/{db['ssh_user']}/{release_tag}"
     destination = f"/srv/docs.python.org/release/{release_tag}"
 
-    def execute_command(command: str) -> None:
-        channel = transport.open_session()
-        channel.exec_command(command)
-        if channel.recv_exit_status() != 0:
-            raise ReleaseException(channel.recv_stderr(1000))
-
     docs_filename = f"python-{release_tag}-docs-html"
-    execute_command(f"mkdir -p {destination}")
-    execute_command(f"unzip {source}/docs/{docs_filename}.zip -d {destination}")
-    execute_command(f"mv /{destination}/{docs_filename}/* {destination}")
-    execute_command(f"rm -rf /{destination}/{docs_filename}")
-    execute_command(f"chgrp -R docs {destination}")
-    execute_command(f"chmod -R 775 {destination}")
-    execute_command(f"find {destination} -type f -exec chmod 664 {{}} \\;")
+    execute_commands(
+        client,
+        [
+            f"mkdir -p {destination}",
+            f"unzip {source}/docs/{docs_filename}.zip -d {destination}",
+            f"mv /{destination}/{docs_filename}/* {destination}",
+            f"rm -rf /{destination}/{docs_filename}",
+            f"chgrp -R docs {destination}",
+            # 775 for directories and 664 for files, in a single pass.
+            f"chmod -R a-x,ug=rwX,o=rX {destination}",
+        ],
+    )
 
 
 def extract_github_owner(url: str) -> str:
-    if https_match := re.match(r"(https://)?github\.com/([^/]+)/", url):
+    if https_match := GITHUB_HTTPS_OWNER_REGEXP.match(url):
         return https_match.group(2)
-    elif ssh_match := re.match(r"^git@github\.com:([^/]+)/", url):
+    elif ssh_match := GITHUB_SSH_OWNER_REGEXP.match(url):
         return ssh_match.group(1)
     else:
         raise ReleaseException(
@@ -825,23 +1429,11 @@ def extract_github_owner(url: str) -> str:
 
 def start_build_of_source_and_docs(db: ReleaseShelf) -> None:
     # Get the git commit SHA for the tag
-    commit_sha = (
-        subprocess.check_output(
-            ["git", "rev-list", "-n", "1", db["release"].gitname], cwd=db["git_repo"]
-        )
-        .decode()
-        .strip()
-    )
+    commit_sha = get_commit_sha(db["git_repo"], db["release"].gitname)
 
     # Get the owner of the GitHub repo (first path segment in a 'github.com' remote URL)
     # This works for both 'https' and 'ssh' style remote URLs.
-    origin_remote_url = (
-        subprocess.check_output(
-            ["git", "ls-remote", "--get-url", "origin"], cwd=db["git_repo"]
-        )
-        .decode()
-        .strip()
-    )
+    origin_remote_url = get_origin_remote_url(db["git_repo"])
     origin_remote_github_owner = extract_github_owner(origin_remote_url)
     # We ask for human verification at this point since this commit SHA is 'locked in'
     print()
@@ -893,48 +1485,84 @@ def create_release_object_in_db(db: ReleaseShelf) -> None:
 
 
 def wait_until_all_files_are_in_folder(db: ReleaseShelf) -> None:
-    client = paramiko.SSHClient()
-    client.load_system_host_keys()
-    client.set_missing_host_key_policy(paramiko.WarningPolicy)
-    client.connect(DOWNLOADS_SERVER, port=22, username=db["ssh_user"])
+    client = get_ssh_client(DOWNLOADS_SERVER, db["ssh_user"])
+    transport = client.get_transport()
+    assert transport is not None, f"SSH transport to {DOWNLOADS_SERVER} is None"
     ftp_client = client.open_sftp()
 
     destination = f"/srv/www.python.org/ftp/python/{db['release'].normalized()}"
 
-    are_all_files_there = False
     release = str(db["release"])
-    print()
-    while not are_all_files_there:
+    expected_files = {
+        "Linux": f"Python-{release}.tgz",
+        "Windows": f"python-{release}.exe",
+        "Mac": f"python-{release}-macos11.pkg",
+    }
+
+    def list_destination() -> set[str]:
         try:
-            all_files = set(ftp_client.listdir(destination))
+            return set(ftp_client.listdir(destination))
         except FileNotFoundError:
             raise FileNotFoundError(
                 f"The release folder in {destination} has not been created"
             ) from None
-        are_windows_files_there = f"python-{release}.exe" in all_files
-        are_macos_files_there = f"python-{release}-macos11.pkg" in all_files
-        are_linux_files_there = f"Python-{release}.tgz" in all_files
-        are_all_files_there = (
-            are_linux_files_there and are_windows_files_there and are_macos_files_there
+
+    # Rather than listing the folder every second, have the server tell us
+    # about new files as they land. The watch is established before the first
+    # listing so that no file can slip in between; if inotifywait is missing
+    # we fall back to polling.
+    watcher = transport.open_session()
+    watcher.exec_command(
+        "inotifywait --monitor --event create,moved_to --format %f "
+        + shlex.quote(destination)
+    )
+    watching = any(
+        line.startswith("Watches established") for line in watcher.makefile_stderr("r")
+    )
+    events = watcher.makefile("r")
+    # Don't rely on the watch alone: if no event came for a while, list the
+    # folder again in case one was missed or the folder was replaced.
+    watcher.settimeout(60)
+
+    wanted = set(expected_files.values())
+    present = list_destination()
+    # When polling, back off while nothing changes so an idle wait of hours
+    # does not list the folder every second, but look again soon after a
+    # file has landed.
+    delay = 0.2
+    shown = ""
+    print()
+    while wanted - present:
+        ticks = "  ".join(
+            f"{platform} {'✅' if filename in present else '❌'}"
+            for platform, filename in expected_files.items()
         )
-        if not are_all_files_there:
-            linux_tick = "✅" if are_linux_files_there else "❌"
-            windows_tick = "✅" if are_windows_files_there else "❌"
-            macos_tick = "✅" if are_macos_files_there else "❌"
-            print(
-                f"\rWaiting for files: Linux {linux_tick}  Windows {windows_tick}  Mac {macos_tick} ",
-                flush=True,
-                end="",
-            )
-            time.sleep(1)
+        # Only redraw when a file we wait for has arrived, not on every
+        # listing or on events about other files.
+        if ticks != shown:
+            print(f"\rWaiting for files: {ticks} ", flush=True, end="")
+            shown = ticks
+        if watching:
+            try:
+                event = events.readline()
+            except TimeoutError:
+                present = list_destination()
+                continue
+            if event:
+                present.add(event.rstrip("\n"))
+                continue
+            # The watcher went away, carry on polling.
+            watching = False
+        time.sleep(delay)
+        latest = list_destination()
+        delay = 0.2 if latest - present else min(delay * 1.5, 5.0)
+        present = latest
+    watcher.close()
     print()
 
 
 def run_add_to_python_dot_org(db: ReleaseShelf) -> None:
-    client = paramiko.SSHClient()
-    client.load_system_host_keys()
-    client.set_missing_host_key_policy(paramiko.WarningPolicy)
-    client.connect(DOWNLOADS_SERVER, port=22, username=db["ssh_user"])
+    client = get_ssh_client(DOWNLOADS_SERVER, db["ssh_user"])
     transport = client.get_transport()
     assert transport is not None, f"SSH transport to {DOWNLOADS_SERVER} is None"
 
@@ -949,9 +1577,7 @@ def run_add_to_python_dot_org(db: ReleaseShelf) -> None:
     auth_info = db["auth_info"]
     assert auth_info is not None
 
-    # Do the interactive flow to get an identity for Sigstore
-    issuer = sigstore.oidc.Issuer(sigstore.oidc.DEFAULT_OAUTH_ISSUER_URL)
-    identity_token = issuer.identity_token()
+    identity_token = get_sigstore_token()
 
     stdin, stdout, stderr = client.exec_command(
         f"AUTH_INFO={auth_info} SIGSTORE_IDENTITY_TOKEN={identity_token} python3 add_to_pydotorg.py {db['release']}"
@@ -965,43 +1591,64 @@ def run_add_to_python_dot_org(db: ReleaseShelf) -> None:
     print("-- End of command output --")
 
 
-def purge_the_cdn(db: ReleaseShelf) -> None:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows; U; Windows NT 6.1; en-US; rv:1.9.1.6) Gecko/20091201 Firefox/3.5.6"
-    }
-    normalized_release = db["release"].normalized()
-    urls = [
-        f"https://www.python.org/downloads/release/python-{str(db['release']).replace('.', '')}/",
-        f"https://docs.python.org/release/{db['release']}/",
-        f"https://www.python.org/ftp/python/{normalized_release}/",
+CDN_PURGE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows; U; Windows NT 6.1; en-US; rv:1.9.1.6) Gecko/20091201 Firefox/3.5.6"
+}
+
+
+def cdn_urls(release: Tag) -> tuple[str, ...]:
+    """Return the python.org URLs to purge from the CDN for *release*, once each."""
+    version = str(release)
+    normalized_release = release.normalized()
+    ftp = f"https://www.python.org/ftp/python/{normalized_release}"
+    urls = (
+        f"https://www.python.org/downloads/release/python-{version.replace('.', '')}/",
+        f"https://docs.python.org/release/{version}/",
+        f"{ftp}/",
         f"https://docs.python.org/release/{normalized_release}/",
         "https://www.python.org/downloads/",
         "https://www.python.org/downloads/windows/",
         "https://www.python.org/downloads/macos/",
-    ]
-    # Purge the source URLs and their associated metadata files.
-    source_urls = [
-        f"https://www.python.org/ftp/python/{normalized_release}/Python-{db['release']}.tgz",
-        f"https://www.python.org/ftp/python/{normalized_release}/Python-{db['release']}.tar.xz",
-    ]
-    for source_url in source_urls:
-        urls.extend(
-            [
-                f"{source_url}",
-                f"{source_url}.asc",
-                f"{source_url}.crt",
-                f"{source_url}.sig",
-                f"{source_url}.sigstore",
-                f"{source_url}.spdx.json",
-            ]
-        )
+        # The source tarballs and their associated metadata files.
+        *(
+            f"{ftp}/Python-{version}{extension}{suffix}"
+            for extension in (".tgz", ".tar.xz")
+            for suffix in ("", ".asc", ".crt", ".sig", ".sigstore", ".spdx.json")
+        ),
+    )
+    return tuple(dict.fromkeys(urls))
 
-    for url in urls:
-        req = urllib.request.Request(url=url, headers=headers, method="PURGE")
-        # try:
-        response = urllib.request.urlopen(req)
-        if response.code != 200:
-            raise RuntimeError("Failed to purge the python.org/downloads CDN")
+
+def purge_the_cdn(db: ReleaseShelf) -> None:
+    # When retrying after a failure, only purge what is left.
+    purged = db.get("purged_urls", [])
+    urls = [url for url in cdn_urls(db["release"]) if url not in purged]
+
+    # Without an API token Fastly only purges one URL per request, so send
+    # them all at once.
+    async def _purge(session: aiohttp.ClientSession, url: str) -> str:
+        async with session.request("PURGE", url) as response:
+            if response.status != 200:
+                raise RuntimeError("Failed to purge the python.org/downloads CDN")
+            # The reply is a few bytes of JSON; draining it lets the
+            # connection go back to the pool instead of being closed.
+            await response.read()
+        return url
+
+    async def _purge_all() -> list[str | BaseException]:
+        connector = aiohttp.TCPConnector(limit_per_host=16, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(
+            connector=connector, headers=CDN_PURGE_HEADERS
+        ) as session:
+            return await asyncio.gather(
+                *(_purge(session, url) for url in urls), return_exceptions=True
+            )
+
+    results = asyncio.run(_purge_all())
+    db["purged_urls"] = [*purged, *(url for url in results if isinstance(url, str))]
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
 
 
 def modify_the_release_to_the_prerelease_pages(db: ReleaseShelf) -> None:
@@ -1023,49 +1670,28 @@ def modify_the_release_to_the_prerelease_pages(db: ReleaseShelf) -> None:
 
 
 def post_release_merge(db: ReleaseShelf) -> None:
-    subprocess.check_call(
-        ["git", "fetch", "--all"],
-        cwd=db["git_repo"],
-    )
+    fetch_all_once(db["git_repo"])
 
     release_tag: release_mod.Tag = db["release"]
     if release_tag.is_feature_freeze_release:
-        subprocess.check_call(
-            ["git", "checkout", "main"],
-            cwd=db["git_repo"],
-        )
+        checkout(db["git_repo"], "main")
     else:
-        subprocess.check_call(
-            ["git", "checkout", release_tag.branch],
-            cwd=db["git_repo"],
-        )
+        checkout(db["git_repo"], release_tag.branch)
 
-    subprocess.check_call(
-        ["git", "merge", "--no-squash", f"v{db['release']}"],
-        cwd=db["git_repo"],
-    )
+    git(db["git_repo"], "merge", "--no-squash", f"v{release_tag}")
 
 
 def post_release_tagging(db: ReleaseShelf) -> None:
     release_tag: release_mod.Tag = db["release"]
 
-    subprocess.check_call(
-        ["git", "fetch", "--all"],
-        cwd=db["git_repo"],
-    )
+    fetch_all_once(db["git_repo"])
 
-    subprocess.check_call(
-        ["git", "checkout", release_tag.branch],
-        cwd=db["git_repo"],
-    )
+    checkout(db["git_repo"], release_tag.branch)
 
-    with cd(db["git_repo"]):
-        release_mod.done(db["release"])
+    with contextlib.chdir(db["git_repo"]):
+        release_mod.done(release_tag)
 
-    subprocess.check_call(
-        ["git", "commit", "-a", "-m", f"Post {db['release']}"],
-        cwd=db["git_repo"],
-    )
+    git(db["git_repo"], "commit", "-a", "-m", f"Post {release_tag}")
 
 
 def maybe_prepare_new_main_branch(db: ReleaseShelf) -> None:
@@ -1074,30 +1700,22 @@ def maybe_prepare_new_main_branch(db: ReleaseShelf) -> None:
     if not release_tag.is_feature_freeze_release:
         return
 
-    subprocess.check_call(
-        ["git", "checkout", "main"],
-        cwd=db["git_repo"],
-    )
+    checkout(db["git_repo"], "main")
 
     new_release = release_tag.next_minor_release()
-    with cd(db["git_repo"]):
+    with contextlib.chdir(db["git_repo"]):
         release_mod.bump(new_release)
 
     prev_branch = f"{release_tag.major}.{release_tag.minor}"
     new_branch = f"{release_tag.major}.{int(release_tag.minor)+1}"
     whatsnew_file = f"Doc/whatsnew/{new_branch}.rst"
-    with cd(db["git_repo"]), open(whatsnew_file, "w") as f:
-        f.write(WHATS_NEW_TEMPLATE.format(version=new_branch, prev_version=prev_branch))
-
-    subprocess.check_call(
-        ["git", "add", whatsnew_file],
-        cwd=db["git_repo"],
+    (db["git_repo"] / whatsnew_file).write_text(
+        WHATS_NEW_TEMPLATE.format(version=new_branch, prev_version=prev_branch)
     )
 
-    subprocess.check_call(
-        ["git", "commit", "-a", "-m", f"Python {new_release}"],
-        cwd=db["git_repo"],
-    )
+    git(db["git_repo"], "add", whatsnew_file)
+
+    git(db["git_repo"], "commit", "-a", "-m", f"Python {new_release}")
 
 
 def branch_new_versions(db: ReleaseShelf) -> None:
@@ -1106,28 +1724,30 @@ def branch_new_versions(db: ReleaseShelf) -> None:
     if not release_tag.is_feature_freeze_release:
         return
 
-    subprocess.check_call(["git", "checkout", "main"], cwd=db["git_repo"])
-
-    subprocess.check_call(
-        ["git", "checkout", "-b", release_tag.branch],
-        cwd=db["git_repo"],
-    )
+    # Branch off main directly, without checking it out first.
+    git(db["git_repo"], "checkout", "-b", release_tag.branch, "main")
 
 
+@functools.cache
 def is_mirror(repo: Path, remote: str) -> bool:
     """Return True if the `repo` directory was created with --mirror."""
 
-    cmd = ["git", "config", "--local", "--get", f"remote.{remote}.mirror"]
+    # Read the setting from the repository's config file rather than starting
+    # git, unless the file is somewhere else or not plain enough to parse.
+    config = configparser.ConfigParser(strict=False, interpolation=None)
+    with contextlib.suppress(configparser.Error, ValueError):
+        if config.read(repo / ".git" / "config"):
+            return config.getboolean(f'remote "{remote}"', "mirror", fallback=False)
     try:
-        out = subprocess.check_output(cmd, cwd=repo)
+        out = git_output(repo, "config", "--local", "--get", f"remote.{remote}.mirror")
     except subprocess.CalledProcessError:
         return False
-    return out.startswith(b"true")
+    return out.startswith("true")
 
 
 def push_to_local_fork(db: ReleaseShelf) -> None:
     def _push_to_local(dry_run: bool = False) -> None:
-        git_command = ["git", "push"]
+        git_command = ["push"]
         if dry_run:
             git_command.append("--dry-run")
 
@@ -1136,10 +1756,7 @@ def push_to_local_fork(db: ReleaseShelf) -> None:
             # mirrors push everything always, specifying `--tags` or refspecs doesn't work.
             git_command += ["HEAD", "--tags"]
 
-        subprocess.check_call(
-            git_command,
-            cwd=db["git_repo"],
-        )
+        git(db["git_repo"], *git_command)
 
     _push_to_local(dry_run=True)
     if not ask_question(
@@ -1154,29 +1771,29 @@ def push_to_upstream(db: ReleaseShelf) -> None:
 
     def _push_to_upstream(dry_run: bool = False) -> None:
         branch = f"{release_tag.major}.{release_tag.minor}"
-        git_command = ["git", "push"]
+        git_command = ["push"]
         if dry_run:
             git_command.append("--dry-run")
 
         if release_tag.is_alpha_release:
-            subprocess.check_call(
-                git_command + ["--tags", "git@github.com:python/cpython.git", "main"],
-                cwd=db["git_repo"],
-            )
+            branches = ["main"]
         elif release_tag.is_feature_freeze_release:
-            subprocess.check_call(
-                git_command + ["--tags", "git@github.com:python/cpython.git", branch],
-                cwd=db["git_repo"],
-            )
-            subprocess.check_call(
-                git_command + ["--tags", "git@github.com:python/cpython.git", "main"],
-                cwd=db["git_repo"],
-            )
+            branches = [branch, "main"]
         else:
-            subprocess.check_call(
-                git_command + ["--tags", "git@github.com:python/cpython.git", branch],
-                cwd=db["git_repo"],
-            )
+            branches = [branch]
+
+        # A single atomic push negotiates once and either updates every ref or
+        # none of them. Local pre-push hooks are meant for development pushes,
+        # the release has been checked already.
+        git(
+            db["git_repo"],
+            *git_command,
+            "--atomic",
+            "--no-verify",
+            "--tags",
+            "git@github.com:python/cpython.git",
+            *branches,
+        )
 
     _push_to_upstream(dry_run=True)
     if not ask_question(
@@ -1186,17 +1803,98 @@ def push_to_upstream(db: ReleaseShelf) -> None:
     if not ask_question("Is the target branch unprotected for your user?"):
         raise ReleaseException("The target branch is not unprotected for your user")
     _push_to_upstream(dry_run=False)
+    _fetched_repos.discard(db["git_repo"])
+
+
+TASKS: tuple[Task, ...] = (
+    parallel_tasks(
+        [
+            Task(check_git, "Checking Git is available"),
+            Task(check_make, "Checking make is available"),
+            Task(check_blurb, "Checking blurb is available"),
+            Task(check_docker, "Checking Docker is available"),
+            Task(check_docker_running, "Checking Docker is running"),
+            Task(check_autoconf, "Checking autoconf is available"),
+            Task(
+                check_ssh_connection,
+                f"Validating ssh connection to {DOWNLOADS_SERVER} and {DOCS_SERVER}",
+            ),
+            Task(check_sigstore_client, "Checking Sigstore CLI"),
+        ],
+        "Checking tools and server connections are available",
+    ),
+    # The tasks below may ask questions, so they run one at a time.
+    Task(check_gpg_keys, "Checking GPG keys"),
+    Task(check_buildbots, "Check buildbots are good"),
+    Task(check_cpython_repo_is_clean, "Checking Git repository is clean"),
+    Task(check_magic_number, "Checking the magic number is up-to-date"),
+    Task(prepare_temporary_branch, "Checking out a temporary release branch"),
+    Task(run_blurb_release, "Run blurb release"),
+    Task(check_cpython_repo_is_clean, "Checking Git repository is clean"),
+    Task(prepare_pydoc_topics, "Preparing pydoc topics"),
+    Task(bump_version, "Bump version"),
+    Task(bump_version_in_docs, "Bump version in docs"),
+    Task(check_cpython_repo_is_clean, "Checking Git repository is clean"),
+    Task(run_autoconf, "Running autoconf"),
+    Task(check_cpython_repo_is_clean, "Checking Git repository is clean"),
+    Task(check_pyspecific, "Checking pyspecific"),
+    Task(check_cpython_repo_is_clean, "Checking Git repository is clean"),
+    Task(create_tag, "Create tag"),
+    Task(push_to_local_fork, "Push new tags and branches to private fork"),
+    Task(
+        start_build_of_source_and_docs,
+        "Start the builds for source and docs artifacts",
+    ),
+    Task(
+        send_email_to_platform_release_managers,
+        "Platform release managers have been notified of the commit SHA",
+    ),
+    Task(
+        wait_for_source_and_docs_artifacts,
+        "Wait for source and docs artifacts to build",
+    ),
+    Task(check_doc_unreleased_version, "Check docs for `(unreleased)`"),
+    Task(build_sbom_artifacts, "Building SBOM artifacts"),
+    Task(sign_source_artifacts, "Sign source artifacts"),
+    Task(upload_files_to_downloads_server, "Upload files to the PSF downloads server"),
+    Task(place_files_in_download_folder, "Place files in the download folder"),
+    Task(upload_docs_to_the_docs_server, "Upload docs to the PSF docs server"),
+    Task(unpack_docs_in_the_docs_server, "Place docs files in the docs folder"),
+    Task(wait_until_all_files_are_in_folder, "Wait until all files are ready"),
+    Task(create_release_object_in_db, "The Django release object has been created"),
+    Task(post_release_merge, "Merge the tag into the release branch"),
+    Task(branch_new_versions, "Branch out new versions and prepare main branch"),
+    Task(post_release_tagging, "Final touches for the release"),
+    Task(
+        maybe_prepare_new_main_branch,
+        "prepare new main branch for feature freeze",
+    ),
+    Task(push_to_upstream, "Push new tags and branches to upstream"),
+    Task(remove_temporary_branch, "Removing temporary release branch"),
+    Task(run_add_to_python_dot_org, "Add files to python.org download page"),
+    Task(purge_the_cdn, "Purge the CDN of python.org/downloads"),
+    Task(modify_the_release_to_the_prerelease_pages, "Modify the pre-release page"),
+)
+
+
+def _release_type(release: str) -> str:
+    if not RELEASE_REGEXP.fullmatch(release):
+        raise argparse.ArgumentTypeError("Invalid release string")
+    return release
+
+
+def _api_key(api_key: str) -> str:
+    if not API_KEY_REGEXP.fullmatch(api_key):
+        raise argparse.ArgumentTypeError(
+            "Invalid API key format. It must be on the form USER:API_KEY"
+        )
+    return api_key
 
 
 def main() -> None:
 
     parser = argparse.ArgumentParser(description="Make a CPython release.")
 
-    def _release_type(release: str) -> str:
-        if not RELEASE_REGEXP.match(release):
-            raise argparse.ArgumentTypeError("Invalid release string")
-        return release
-
     parser.add_argument(
         "--release",
         dest="release",
@@ -1212,16 +1910,12 @@ def main() -> None:
         type=str,
     )
 
-    def _api_key(api_key: str) -> str:
-        if not API_KEY_REGEXP.match(api_key):
-            raise argparse.ArgumentTypeError(
-                "Invalid API key format. It must be on the form USER:API_KEY"
-            )
-        return api_key
-
     parser.add_argument(
         "--auth-key",
         dest="auth_key",
+        # argparse runs string defaults through `type` too, so a key taken
+        # from the environment is validated the same way.
+        default=os.environ.get("AUTH_INFO"),
         help="API key for python.org in the form 'USER:API_KEY'",
         type=_api_key,
     )
@@ -1233,9 +1927,8 @@ def main() -> None:
         type=str,
     )
     args = parser.parse_args()
-
-    auth_key = args.auth_key or os.getenv("AUTH_INFO")
-    assert isinstance(auth_key, str), "We need an AUTH_INFO env var or --auth-key"
+    if args.auth_key is None:
+        parser.error("We need an AUTH_INFO env var or --auth-key")
 
     if sys.platform not in ("darwin", "linux"):
         print(
@@ -1254,80 +1947,16 @@ fix these things in this script so it also supports your platform.
 
     release_tag = release_mod.Tag(args.release)
     no_gpg = release_tag.as_tuple() >= (3, 14)  # see PEP 761
-    tasks = [
-        Task(check_git, "Checking Git is available"),
-        Task(check_make, "Checking make is available"),
-        Task(check_blurb, "Checking blurb is available"),
-        Task(check_docker, "Checking Docker is available"),
-        Task(check_docker_running, "Checking Docker is running"),
-        Task(check_autoconf, "Checking autoconf is available"),
-        *([] if no_gpg else [Task(check_gpg_keys, "Checking GPG keys")]),
-        Task(
-            check_ssh_connection,
-            f"Validating ssh connection to {DOWNLOADS_SERVER} and {DOCS_SERVER}",
-        ),
-        Task(check_sigstore_client, "Checking Sigstore CLI"),
-        Task(check_buildbots, "Check buildbots are good"),
-        Task(check_cpython_repo_is_clean, "Checking Git repository is clean"),
-        Task(check_magic_number, "Checking the magic number is up-to-date"),
-        Task(prepare_temporary_branch, "Checking out a temporary release branch"),
-        Task(run_blurb_release, "Run blurb release"),
-        Task(check_cpython_repo_is_clean, "Checking Git repository is clean"),
-        Task(prepare_pydoc_topics, "Preparing pydoc topics"),
-        Task(bump_version, "Bump version"),
-        Task(bump_version_in_docs, "Bump version in docs"),
-        Task(check_cpython_repo_is_clean, "Checking Git repository is clean"),
-        Task(run_autoconf, "Running autoconf"),
-        Task(check_cpython_repo_is_clean, "Checking Git repository is clean"),
-        Task(check_pyspecific, "Checking pyspecific"),
-        Task(check_cpython_repo_is_clean, "Checking Git repository is clean"),
-        Task(create_tag, "Create tag"),
-        Task(push_to_local_fork, "Push new tags and branches to private fork"),
-        Task(
-            start_build_of_source_and_docs,
-            "Start the builds for source and docs artifacts",
-        ),
-        Task(
-            send_email_to_platform_release_managers,
-            "Platform release managers have been notified of the commit SHA",
-        ),
-        Task(
-            wait_for_source_and_docs_artifacts,
-            "Wait for source and docs artifacts to build",
-        ),
-        Task(check_doc_unreleased_version, "Check docs for `(unreleased)`"),
-        Task(build_sbom_artifacts, "Building SBOM artifacts"),
-        *([] if no_gpg else [Task(sign_source_artifacts, "Sign source artifacts")]),
-        Task(
-            upload_files_to_downloads_server, "Upload files to the PSF downloads server"
-        ),
-        Task(place_files_in_download_folder, "Place files in the download folder"),
-        Task(upload_docs_to_the_docs_server, "Upload docs to the PSF docs server"),
-        Task(unpack_docs_in_the_docs_server, "Place docs files in the docs folder"),
-        Task(wait_until_all_files_are_in_folder, "Wait until all files are ready"),
-        Task(create_release_object_in_db, "The Django release object has been created"),
-        Task(post_release_merge, "Merge the tag into the release branch"),
-        Task(branch_new_versions, "Branch out new versions and prepare main branch"),
-        Task(post_release_tagging, "Final touches for the release"),
-        Task(
-            maybe_prepare_new_main_branch,
-            "prepare new main branch for feature freeze",
-        ),
-        Task(push_to_upstream, "Push new tags and branches to upstream"),
-        Task(remove_temporary_branch, "Removing temporary release branch"),
-        Task(run_add_to_python_dot_org, "Add files to python.org download page"),
-        Task(purge_the_cdn, "Purge the CDN of python.org/downloads"),
-        Task(modify_the_release_to_the_prerelease_pages, "Modify the pre-release page"),
-    ]
     automata = ReleaseDriver(
         git_repo=args.repo,
         release_tag=release_tag,
-        api_key=auth_key,
+        api_key=args.auth_key,
         ssh_user=args.ssh_user,
         sign_gpg=not no_gpg,
-        tasks=tasks,
+        tasks=TASKS,
     )
-    automata.run()
+    with ssh_control_master():
+        automata.run()
 
 
 if __name__ == "__main__":
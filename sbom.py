@@ -419,6 +419,7 @@ def create_cpython_sbom(
     sbom_data: SBOM,
     cpython_version: str,
     artifact_path: str,
+    artifact_checksum_sha256: str | None = None,
 ) -> None:
     """Creates the top-level SBOM metadata and the CPython SBOM package."""
 
@@ -429,9 +430,10 @@ def create_cpython_sbom(
     artifact_name = os.path.basename(artifact_path)
     artifact_download_location = f"https://www.python.org/ftp/python/{cpython_version_without_suffix}/{artifact_name}"
 
-    # Take a hash of the artifact
-    with open(artifact_path, mode="rb") as f:
-        artifact_checksum_sha256 = hashlib.sha256(f.read()).hexdigest()
+    # Take a hash of the artifact, unless the caller already has one
+    if artifact_checksum_sha256 is None:
+        with open(artifact_path, mode="rb") as f:
+            artifact_checksum_sha256 = hashlib.file_digest(f, "sha256").hexdigest()
 
     sbom_data.update(
         {
@@ -496,7 +498,9 @@ def create_cpython_sbom(
     sbom_data["packages"].append(sbom_cpython_package)
 
 
-def create_sbom_for_source_tarball(tarball_path: str) -> SBOM:
+def create_sbom_for_source_tarball(
+    tarball_path: str, tarball_checksum_sha256: str | None = None
+) -> SBOM:
     """Stitches together an SBOM for a source tarball"""
     tarball_name = os.path.basename(tarball_path)
 
@@ -532,7 +536,10 @@ def create_sbom_for_source_tarball(tarball_path: str) -> SBOM:
     sbom_data: SBOM = json.loads(sbom_bytes)
 
     create_cpython_sbom(
-        sbom_data, cpython_version=cpython_version, artifact_path=tarball_path
+        sbom_data,
+        cpython_version=cpython_version,
+        artifact_path=tarball_path,
+        artifact_checksum_sha256=tarball_checksum_sha256,
     )
     sbom_cpython_package_spdx_id = spdx_id("SPDXRef-PACKAGE-cpython")
 
@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock
 
 import aiohttp
 import pytest
+from pytest_mock import MockerFixture
 
 import buildbotapi
 
@@ -33,16 +34,17 @@ def load(filename: str) -> str:
 @pytest.mark.asyncio
 async def test_buildbotapi_authenticate() -> None:
     # Arrange
-    async with AsyncMock(aiohttp.ClientSession) as mock_session:
-        api = buildbotapi.BuildBotAPI(mock_session)
+    mock_session = AsyncMock(aiohttp.ClientSession)
+    api = buildbotapi.BuildBotAPI(mock_session)
 
-        # Act
-        await api.authenticate(token="")
+    # Act
+    await api.authenticate(token="")
 
     # Assert
     mock_session.get.assert_called_with(
         "https://buildbot.python.org/all/auth/login", params={"token": ""}
     )
+    mock_session.get.return_value.__aexit__.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -138,3 +140,25 @@ async def test_buildbotapi_is_builder_failing_currently_yes(
         "&&builderid__eq=3&&order=-complete_at&&limit=1"
     )
     assert failing is expected
+
+
+@pytest.mark.asyncio
+async def test_buildbotapi_retries_when_throttled(mocker: MockerFixture) -> None:
+    # Arrange
+    mock_sleep = mocker.patch("buildbotapi.asyncio.sleep")
+    mock_session = AsyncMock(aiohttp.ClientSession)
+    throttled = AsyncMock(status=429)
+    ok = AsyncMock(status=200)
+    ok.text.return_value = load("tests/buildbotapi/failure.json")
+    mock_session.get.return_value.__aenter__.side_effect = [throttled, throttled, ok]
+    api = buildbotapi.BuildBotAPI(mock_session)
+
+    # Act
+    failing = await api.is_builder_failing_currently(
+        builder=buildbotapi.Builder(builderid=3)
+    )
+
+    # Assert
+    assert failing is True
+    assert mock_session.get.call_count == 3
+    assert [call.args[0] for call in mock_sleep.await_args_list] == [0.5, 1.0]
@@ -68,3 +68,23 @@ def test_tweak_patchlevel(tmp_path: Path) -> None:
         '#define PY_VERSION              "3.14.0b2"',
     ):
         assert expected in new_contents
+
+
+@pytest.mark.parametrize(
+    ["version", "ok"],
+    [
+        (b"xz (XZ Utils) 5.2.5\nliblzma 5.2.5\n", False),
+        (b"xz (XZ Utils) 5.4.5\nliblzma 5.4.5\n", True),
+        (b"xz (XZ Utils) 5.6.4\nliblzma 5.6.4\n", True),
+    ],
+)
+def test_check_xz_version(mocker: MockerFixture, version: bytes, ok: bool) -> None:
+    # Arrange
+    mocker.patch("release.get_output", return_value=version)
+
+    # Act / Assert
+    if ok:
+        release.check_xz_version()
+    else:
+        with pytest.raises(SystemExit):
+            release.check_xz_version()
@@ -113,7 +113,9 @@ def test_check_doc_unreleased_version_not_ok(monkeypatch, tmp_path: Path) -> Non
         run_release.check_doc_unreleased_version(cast(ReleaseShelf, db))
 
 
-def test_check_doc_unreleased_version_waived(monkeypatch, tmp_path: Path) -> None:
+def test_check_doc_unreleased_version_waived(
+    monkeypatch, capsys, tmp_path: Path
+) -> None:
     prepare_fake_docs(
         tmp_path,
         "<div>New in 3.13.0rc1 (unreleased)</div>",
@@ -124,3 +126,876 @@ def test_check_doc_unreleased_version_waived(monkeypatch, tmp_path: Path) -> Non
     }
     with fake_answers(monkeypatch, ["yes"]):
         run_release.check_doc_unreleased_version(cast(ReleaseShelf, db))
+    assert "index.html:1:<div>New in 3.13.0rc1 (unreleased)</div>" in (
+        capsys.readouterr().out
+    )
+
+
+def test_git(mocker) -> None:
+    mock_check_call = mocker.patch("subprocess.check_call")
+
+    run_release.git(Path("/path/to/cpython"), "commit", "-a", "--amend", "--no-edit")
+
+    mock_check_call.assert_called_once_with(
+        [
+            "git",
+            "-C",
+            "/path/to/cpython",
+            "-c",
+            "gc.auto=0",
+            "-c",
+            "maintenance.auto=false",
+            "commit",
+            "-a",
+            "--amend",
+            "--no-edit",
+        ]
+    )
+
+
+def test_git_output(mocker) -> None:
+    mock_check_output = mocker.patch(
+        "subprocess.check_output", return_value=b" M Lib/os.py\n"
+    )
+
+    output = run_release.git_output(Path("/path/to/cpython"), "status", "--porcelain")
+
+    assert output == "M Lib/os.py"
+    args, kwargs = mock_check_output.call_args
+    assert args == (["git", "-C", "/path/to/cpython", "status", "--porcelain"],)
+    assert kwargs["env"]["GIT_OPTIONAL_LOCKS"] == "0"
+
+
+@pytest.fixture
+def sftp_client(mocker) -> run_release.MySFTPClient:
+    """A MySFTPClient with every remote operation mocked out."""
+    client = object.__new__(run_release.MySFTPClient)
+    for name in ("mkdirs", "execute", "put", "posix_rename", "close"):
+        mocker.patch.object(client, name)
+    mocker.patch.object(client, "sha256sums", return_value={})
+    mocker.patch.object(client, "clone", return_value=client)
+    return client
+
+
+def test_put_dir_creates_remote_tree_once(mocker, tmp_path: Path, sftp_client) -> None:
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "c").mkdir()
+    (tmp_path / "top.txt").write_text("top")
+    (tmp_path / "a" / "b" / "nested.txt").write_text("nested")
+    mock_sha256 = mocker.patch("run_release.file_sha256")
+
+    sftp_client.put_dir(tmp_path, "/remote", progress=mocker.Mock())
+
+    # Two files, so one extra SFTP session is opened and closed again.
+    sftp_client.clone.assert_called_once_with()
+    sftp_client.close.assert_called_once_with()
+
+    sftp_client.mkdirs.assert_called_once()
+    assert sorted(sftp_client.mkdirs.call_args.args[0]) == [
+        "/remote",
+        "/remote/a",
+        "/remote/a/b",
+        "/remote/c",
+    ]
+    # Each file is uploaded under a temporary name and renamed into place.
+    assert sorted(call.args[1] for call in sftp_client.put.call_args_list) == [
+        "/remote/a/b/nested.txt.part",
+        "/remote/top.txt.part",
+    ]
+    assert sorted(call.args for call in sftp_client.posix_rename.call_args_list) == [
+        ("/remote/a/b/nested.txt.part", "/remote/a/b/nested.txt"),
+        ("/remote/top.txt.part", "/remote/top.txt"),
+    ]
+    # Nothing is on the server yet, so there is nothing to compare against.
+    mock_sha256.assert_not_called()
+
+
+def test_put_dir_skips_unchanged_files(tmp_path: Path, sftp_client) -> None:
+    (tmp_path / "same.txt").write_text("same")
+    (tmp_path / "changed.txt").write_text("changed")
+    sftp_client.sha256sums.return_value = {
+        "/remote/same.txt": run_release.file_sha256(tmp_path / "same.txt"),
+        "/remote/changed.txt": "0" * 64,
+        "/remote/stale.txt": "0" * 64,
+    }
+
+    sftp_client.put_dir(tmp_path, "/remote")
+
+    sftp_client.put.assert_called_once_with(
+        str(tmp_path / "changed.txt"), "/remote/changed.txt.part"
+    )
+    sftp_client.posix_rename.assert_called_once_with(
+        "/remote/changed.txt.part", "/remote/changed.txt"
+    )
+    sftp_client.execute.assert_called_once_with("rm -f /remote/stale.txt")
+
+
+def test_put_dir_reports_progress_in_batches(
+    mocker, tmp_path: Path, sftp_client
+) -> None:
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (tmp_path / name).write_text(name)
+    mocker.patch("run_release.time.monotonic", return_value=0.0)
+    progress = mocker.Mock()
+
+    sftp_client.put_dir(tmp_path, "/remote", progress=progress)
+
+    progress.assert_called_once_with(3)
+
+
+def test_sha256sums_reads_unescaped_names(mocker) -> None:
+    client = object.__new__(run_release.MySFTPClient)
+    mock_execute = mocker.patch.object(
+        client,
+        "execute",
+        return_value=b"aaa  /remote/plain.txt\0bbb  /remote/odd\\name\n.txt\0",
+    )
+
+    digests = client.sha256sums("/remote")
+
+    assert "sha256sum -z" in mock_execute.call_args.args[0]
+    assert digests == {"/remote/plain.txt": "aaa", "/remote/odd\\name\n.txt": "bbb"}
+
+
+@pytest.mark.parametrize(
+    ["source_uri", "expected_error"],
+    [
+        ("https://github.com/python/cpython/tree/3.13/%s", None),
+        ("https://github.com/python/cpython/tree/main/%s", "SOURCE_URI is incorrect"),
+        (None, "SOURCE_URI not found"),
+    ],
+)
+def test_check_pyspecific(
+    tmp_path: Path, source_uri: str | None, expected_error: str | None
+) -> None:
+    extensions = tmp_path / "Doc" / "tools" / "extensions"
+    extensions.mkdir(parents=True)
+    lines = ["# Support for documenting version of changes, additions, deprecations\n"]
+    if source_uri is not None:
+        lines.append(f"SOURCE_URI = '{source_uri}'\n")
+    (extensions / "pyspecific.py").write_text("".join(lines))
+    db = {
+        "release": Tag("3.13.1"),
+        "git_repo": tmp_path,
+    }
+
+    if expected_error is None:
+        run_release.check_pyspecific(cast(ReleaseShelf, db))
+    else:
+        with pytest.raises(run_release.ReleaseException, match=expected_error):
+            run_release.check_pyspecific(cast(ReleaseShelf, db))
+
+
+def test_check_pyspecific_empty_file(tmp_path: Path) -> None:
+    extensions = tmp_path / "Doc" / "tools" / "extensions"
+    extensions.mkdir(parents=True)
+    (extensions / "pyspecific.py").touch()
+    db = {"release": Tag("3.13.1"), "git_repo": tmp_path}
+
+    with pytest.raises(run_release.ReleaseException, match="SOURCE_URI not found"):
+        run_release.check_pyspecific(cast(ReleaseShelf, db))
+
+
+def test_checkout_skips_current_branch(mocker, tmp_path: Path) -> None:
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/3.13\n")
+    mock_git = mocker.patch("run_release.git")
+
+    assert run_release.current_branch(tmp_path) == "3.13"
+    run_release.checkout(tmp_path, "3.13")
+    mock_git.assert_not_called()
+
+    run_release.checkout(tmp_path, "main")
+    mock_git.assert_called_once_with(tmp_path, "checkout", "main")
+
+    (tmp_path / ".git" / "HEAD").write_text("0123456789abcdef\n")
+    assert run_release.current_branch(tmp_path) is None
+
+
+def test_is_mirror_is_cached(mocker) -> None:
+    mock_git_output = mocker.patch("run_release.git_output", return_value="true")
+    repo = Path("/path/to/mirror")
+
+    assert run_release.is_mirror(repo, "origin")
+    assert run_release.is_mirror(repo, "origin")
+
+    mock_git_output.assert_called_once_with(
+        repo, "config", "--local", "--get", "remote.origin.mirror"
+    )
+
+
+@pytest.mark.parametrize(
+    ["config", "expected"],
+    [
+        ('[remote "origin"]\n\turl = git@example.com:cpython\n', False),
+        ('[remote "origin"]\n\turl = git@example.com:cpython\n\tmirror = true\n', True),
+        ("[core]\n\tbare = true\n", False),
+    ],
+)
+def test_is_mirror_reads_config(
+    mocker, tmp_path: Path, config: str, expected: bool
+) -> None:
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "config").write_text(config)
+    mock_git_output = mocker.patch("run_release.git_output")
+
+    assert run_release.is_mirror(tmp_path, "origin") is expected
+    mock_git_output.assert_not_called()
+
+
+def test_maybe_prepare_new_main_branch(mocker, tmp_path: Path) -> None:
+    (tmp_path / "Doc" / "whatsnew").mkdir(parents=True)
+    mocker.patch("run_release.checkout")
+    mocker.patch("run_release.release_mod.bump")
+    mock_git = mocker.patch("run_release.git")
+    db = {"release": Tag("3.14.0b1"), "git_repo": tmp_path}
+
+    run_release.maybe_prepare_new_main_branch(cast(ReleaseShelf, db))
+
+    whatsnew = (tmp_path / "Doc" / "whatsnew" / "3.15.rst").read_text()
+    assert "What's New In Python 3.15" in whatsnew
+    assert mock_git.call_args_list == [
+        mocker.call(tmp_path, "add", "Doc/whatsnew/3.15.rst"),
+        mocker.call(tmp_path, "commit", "-a", "-m", "Python 3.15.0a0"),
+    ]
+
+
+def test_fetch_all_once(mocker) -> None:
+    mocker.patch.object(run_release, "_fetched_repos", set())
+    mock_git = mocker.patch("run_release.git")
+    repo = Path("/path/to/cpython")
+
+    run_release.fetch_all_once(repo)
+    run_release.fetch_all_once(repo)
+
+    mock_git.assert_called_once_with(repo, "fetch", "--all", "--no-tags", "--jobs=4")
+
+
+def test_check_cpython_repo_is_clean(tmp_path: Path) -> None:
+    run_release.subprocess.check_call(["git", "init", "-q", str(tmp_path)])
+    db = cast(ReleaseShelf, {"git_repo": tmp_path})
+
+    run_release.check_cpython_repo_is_clean(db)
+
+    (tmp_path / "untracked.txt").write_text("dirty\n")
+    with pytest.raises(run_release.ReleaseException, match="not clean"):
+        run_release.check_cpython_repo_is_clean(db)
+
+
+def test_get_commit_sha_peels_annotated_tag(tmp_path: Path) -> None:
+    def git(*args: str) -> str:
+        return run_release.subprocess.check_output(
+            ["git", "-C", str(tmp_path), "-c", "user.name=R", "-c", "user.email=r@x"]
+            + list(args),
+            text=True,
+        ).strip()
+
+    git("init", "-q")
+    git("commit", "-q", "--allow-empty", "-m", "Python 3.13.0")
+    git("tag", "-a", "v3.13.0", "-m", "Python 3.13.0")
+
+    sha = run_release.get_commit_sha(tmp_path, "v3.13.0")
+
+    assert sha == git("rev-parse", "HEAD")
+    assert sha != git("rev-parse", "v3.13.0")
+
+
+@pytest.mark.parametrize("has_regen_script", [True, False])
+def test_check_docker_running_prefetches_autoconf_image(
+    mocker, tmp_path: Path, has_regen_script: bool
+) -> None:
+    mocker.patch("run_release.subprocess.check_call")
+    mock_popen = mocker.patch("run_release.subprocess.Popen")
+    mocker.patch.object(run_release, "_autoconf_image_pull", None)
+    if has_regen_script:
+        (tmp_path / "Tools" / "build").mkdir(parents=True)
+        (tmp_path / "Tools" / "build" / "regen-configure.sh").touch()
+
+    run_release.check_docker_running(cast(ReleaseShelf, {"git_repo": tmp_path}))
+
+    if has_regen_script:
+        mock_popen.assert_not_called()
+        assert run_release._autoconf_image_pull is None
+    else:
+        assert mock_popen.call_args.args[0] == [
+            "docker",
+            "pull",
+            "--quiet",
+            run_release.CPYTHON_AUTOCONF_IMAGE,
+        ]
+        assert run_release._autoconf_image_pull is mock_popen.return_value
+
+
+def test_bump_version_restores_cwd_on_error(mocker, tmp_path: Path) -> None:
+    mocker.patch("run_release.release_mod.bump", side_effect=OSError)
+    cwd = run_release.os.getcwd()
+
+    with pytest.raises(OSError):
+        run_release.bump_version(
+            cast(ReleaseShelf, {"git_repo": tmp_path, "release": Tag("3.13.0")})
+        )
+
+    assert run_release.os.getcwd() == cwd
+
+
+def test_branch_new_versions(mocker) -> None:
+    mock_git = mocker.patch("run_release.git")
+    db = {"release": Tag("3.14.0b1"), "git_repo": Path("/path/to/cpython")}
+
+    run_release.branch_new_versions(cast(ReleaseShelf, db))
+
+    mock_git.assert_called_once_with(
+        Path("/path/to/cpython"), "checkout", "-b", "3.14", "main"
+    )
+
+
+def test_release_paths(tmp_path: Path) -> None:
+    paths = run_release.ReleasePaths.from_release(tmp_path, Tag("3.13.0rc1"))
+
+    assert paths.root == tmp_path / "3.13.0rc1"
+    assert paths.tarballs == (
+        tmp_path / "3.13.0rc1" / "src" / "Python-3.13.0rc1.tgz",
+        tmp_path / "3.13.0rc1" / "src" / "Python-3.13.0rc1.tar.xz",
+    )
+    assert len(paths.docs_artifacts) == 9
+    assert paths.docs_html_tar_bz2 in paths.docs_artifacts
+    assert paths.docs_html_tar_bz2.name == "python-3.13.0rc1-docs-html.tar.bz2"
+
+
+def test_walk_tree(tmp_path: Path) -> None:
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "empty").mkdir()
+    (tmp_path / "top.txt").write_text("top")
+    (tmp_path / "a" / "b" / "two.txt").write_text("two")
+
+    directories, files = run_release.walk_tree(tmp_path, "/remote")
+
+    assert sorted(directories) == [
+        "/remote",
+        "/remote/a",
+        "/remote/a/b",
+        "/remote/empty",
+    ]
+    assert sorted(files) == [
+        (str(tmp_path / "a" / "b" / "two.txt"), "/remote/a/b/two.txt"),
+        (str(tmp_path / "top.txt"), "/remote/top.txt"),
+    ]
+
+
+def _task_ok(db: ReleaseShelf) -> None:
+    pass
+
+
+def _task_fail(db: ReleaseShelf) -> None:
+    raise run_release.ReleaseException("boom")
+
+
+def test_release_driver_resumes(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    tasks = [
+        run_release.Task(_task_ok, "First"),
+        run_release.Task(_task_fail, "Second"),
+    ]
+    kwargs = {
+        "release_tag": Tag("3.13.0"),
+        "git_repo": str(tmp_path),
+        "api_key": "user:key",
+        "ssh_user": "user",
+        "sign_gpg": False,
+    }
+
+    driver = run_release.ReleaseDriver(tasks, **kwargs)
+    with pytest.raises(run_release.ReleaseException):
+        driver.run()
+    driver.db.close()
+
+    tasks[1] = run_release.Task(_task_ok, "Second")
+    driver = run_release.ReleaseDriver(tasks, **kwargs)
+    assert [task.description for task in driver.completed_tasks] == ["First"]
+    driver.run()
+    driver.db.close()
+
+
+def test_ssh_control_master(mocker, monkeypatch) -> None:
+    monkeypatch.delenv("GIT_SSH_COMMAND", raising=False)
+    mock_run = mocker.patch("run_release.subprocess.run")
+
+    with run_release.ssh_control_master():
+        ssh_command = run_release.os.environ["GIT_SSH_COMMAND"]
+        assert ssh_command.startswith("ssh -o ControlMaster=auto")
+        control_path = ssh_command.split("ControlPath=")[1].split()[0]
+        socket = Path(control_path).with_name("abc123")
+        socket.touch()
+
+    assert "GIT_SSH_COMMAND" not in run_release.os.environ
+    mock_run.assert_called_once_with(
+        ["ssh", "-o", f"ControlPath={socket}", "-O", "exit", "master"],
+        stdout=run_release.subprocess.DEVNULL,
+        stderr=run_release.subprocess.DEVNULL,
+    )
+
+
+def test_parallel_tasks() -> None:
+    ran = []
+
+    def record(name: str) -> run_release.Task:
+        return run_release.Task(lambda db: ran.append(db["release"]), name)
+
+    def fail(message: str) -> run_release.Task:
+        def _fail(db: ReleaseShelf) -> None:
+            raise run_release.ReleaseException(message)
+
+        return run_release.Task(_fail, message)
+
+    group = run_release.parallel_tasks(
+        [record("one"), fail("first"), record("two"), fail("second")], "Group"
+    )
+
+    assert group.description == "Group"
+    with pytest.raises(run_release.ReleaseException, match="first") as excinfo:
+        group(cast(ReleaseShelf, {"release": "3.13.0"}))
+    assert ran == ["3.13.0", "3.13.0"]
+    assert excinfo.value.__notes__ == ["second failed: second"]
+
+
+def test_purge_the_cdn(mocker) -> None:
+    mocker.patch("run_release.aiohttp.TCPConnector")
+    mock_session = mocker.patch("run_release.aiohttp.ClientSession")
+    session = mock_session.return_value.__aenter__.return_value = mocker.MagicMock()
+    response = session.request.return_value.__aenter__.return_value
+    response.status = 200
+    response.read = mocker.AsyncMock(return_value=b'{"status": "ok"}')
+    db = {"release": Tag("3.13.0")}
+
+    run_release.purge_the_cdn(cast(ReleaseShelf, db))
+
+    assert response.read.await_count == 18
+
+    assert {call.args[0] for call in session.request.call_args_list} == {"PURGE"}
+    urls = [call.args[1] for call in session.request.call_args_list]
+    assert len(urls) == len(set(urls)) == 18
+    assert "https://docs.python.org/release/3.13.0/" in urls
+
+    assert len(db["purged_urls"]) == 18
+
+    # A retry only purges what was left.
+    db["purged_urls"] = db["purged_urls"][:10]
+    response.status = 503
+    with pytest.raises(RuntimeError):
+        run_release.purge_the_cdn(cast(ReleaseShelf, db))
+    assert session.request.call_count == 18 + 8
+    assert len(db["purged_urls"]) == 10
+
+
+def test_docs_upload_overlaps_downloads_upload(mocker, tmp_path: Path) -> None:
+    mock_upload = mocker.patch("run_release.upload_files_to_server")
+    db = {"release": Tag("3.13.0"), "ssh_user": "user", "git_repo": tmp_path}
+
+    run_release.upload_files_to_downloads_server(cast(ReleaseShelf, db))
+    run_release.upload_docs_to_the_docs_server(cast(ReleaseShelf, db))
+
+    assert sorted(call.args[1] for call in mock_upload.call_args_list) == [
+        run_release.DOCS_SERVER,
+        run_release.DOWNLOADS_SERVER,
+    ]
+    assert not run_release.background_uploads
+
+    # A resumed run uploads the docs itself.
+    run_release.upload_docs_to_the_docs_server(cast(ReleaseShelf, db))
+    mock_upload.assert_called_with(db, run_release.DOCS_SERVER)
+
+
+@pytest.mark.parametrize(
+    ["api_key", "valid"],
+    [
+        ("user:0123abcd", True),
+        ("user:0123abcd trailing", False),
+        ("user", False),
+    ],
+)
+def test_api_key_validation(api_key: str, valid: bool) -> None:
+    if valid:
+        assert run_release._api_key(api_key) == api_key
+    else:
+        with pytest.raises(run_release.argparse.ArgumentTypeError):
+            run_release._api_key(api_key)
+
+
+@pytest.mark.parametrize(
+    ["watcher_stderr", "listings"],
+    [
+        ("Setting up watches.\nWatches established.\n", 1),
+        ("bash: inotifywait: command not found\n", 3),
+    ],
+)
+def test_wait_until_all_files_are_in_folder(
+    mocker, watcher_stderr: str, listings: int
+) -> None:
+    mocker.patch.object(run_release, "_ssh_clients", {})
+    mock_client = mocker.patch("run_release.paramiko.SSHClient").return_value
+    watcher = mock_client.get_transport.return_value.open_session.return_value
+    watcher.makefile_stderr.return_value = io.StringIO(watcher_stderr)
+    watcher.makefile.return_value = io.StringIO(
+        "python-3.13.0.exe\npython-3.13.0-macos11.pkg\n"
+    )
+    mock_listdir = mock_client.open_sftp.return_value.listdir
+    mock_listdir.side_effect = [
+        ["Python-3.13.0.tgz"],
+        ["Python-3.13.0.tgz", "python-3.13.0.exe"],
+        ["Python-3.13.0.tgz", "python-3.13.0.exe", "python-3.13.0-macos11.pkg"],
+    ]
+    mocker.patch("run_release.time.sleep")
+    db = {"release": Tag("3.13.0"), "ssh_user": "user"}
+
+    run_release.wait_until_all_files_are_in_folder(cast(ReleaseShelf, db))
+
+    assert mock_listdir.call_count == listings
+
+
+def test_wait_until_all_files_are_in_folder_relists_on_timeout(mocker) -> None:
+    mocker.patch.object(run_release, "_ssh_clients", {})
+    mock_client = mocker.patch("run_release.paramiko.SSHClient").return_value
+    watcher = mock_client.get_transport.return_value.open_session.return_value
+    watcher.makefile_stderr.return_value = io.StringIO("Watches established.\n")
+    # The watch misses every file, so only the listings find them.
+    watcher.makefile.return_value.readline.side_effect = TimeoutError
+    mock_listdir = mock_client.open_sftp.return_value.listdir
+    mock_listdir.side_effect = [
+        ["Python-3.13.0.tgz"],
+        ["Python-3.13.0.tgz", "python-3.13.0.exe", "python-3.13.0-macos11.pkg"],
+    ]
+    db = {"release": Tag("3.13.0"), "ssh_user": "user"}
+
+    run_release.wait_until_all_files_are_in_folder(cast(ReleaseShelf, db))
+
+    watcher.settimeout.assert_called_once_with(60)
+    assert mock_listdir.call_count == 2
+
+
+def test_wait_until_all_files_are_in_folder_backs_off(mocker, capsys) -> None:
+    mocker.patch.object(run_release, "_ssh_clients", {})
+    mock_client = mocker.patch("run_release.paramiko.SSHClient").return_value
+    watcher = mock_client.get_transport.return_value.open_session.return_value
+    watcher.makefile_stderr.return_value = io.StringIO("")
+    mock_client.open_sftp.return_value.listdir.side_effect = [
+        ["Python-3.13.0.tgz"],
+        ["Python-3.13.0.tgz"],
+        ["Python-3.13.0.tgz"],
+        ["Python-3.13.0.tgz", "python-3.13.0.exe"],
+        ["Python-3.13.0.tgz", "python-3.13.0.exe", "python-3.13.0-macos11.pkg"],
+    ]
+    mock_sleep = mocker.patch("run_release.time.sleep")
+    db = {"release": Tag("3.13.0"), "ssh_user": "user"}
+
+    run_release.wait_until_all_files_are_in_folder(cast(ReleaseShelf, db))
+
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert delays == pytest.approx([0.2, 0.3, 0.45, 0.2])
+    # The status line is only redrawn when a platform's file arrives.
+    assert capsys.readouterr().out.count("Waiting for files") == 2
+
+
+def test_prepare_pydoc_topics_links_generated_file(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    source = tmp_path / "Doc" / "build" / "pydoc-topics" / "topics.py"
+    source.parent.mkdir(parents=True)
+    source.write_text("topics = {}\n")
+    destination = tmp_path / "Lib" / "pydoc_data" / "topics.py"
+    destination.parent.mkdir(parents=True)
+    destination.write_text("old\n")
+    monkeypatch.setattr(run_release.subprocess, "check_call", lambda *a, **k: 0)
+    monkeypatch.setattr(run_release, "git", lambda *args: None)
+    db = cast(ReleaseShelf, {"git_repo": tmp_path})
+
+    run_release.prepare_pydoc_topics(db)
+
+    assert destination.read_text() == "topics = {}\n"
+    assert destination.samefile(source)
+
+
+def test_file_sha256(tmp_path: Path) -> None:
+    artifact = tmp_path / "Python-3.13.0.tgz"
+    artifact.write_bytes(b"first")
+    first = run_release.file_sha256(artifact)
+    assert first == run_release.file_sha256(str(artifact))
+
+    artifact.write_bytes(b"second build")
+    assert run_release.file_sha256(artifact) != first
+
+
+@pytest.mark.parametrize(
+    ["tag", "branches"],
+    [
+        ("3.14.0a1", ["main"]),
+        ("3.14.0b1", ["3.14", "main"]),
+        ("3.13.1", ["3.13"]),
+    ],
+)
+def test_push_to_upstream(mocker, monkeypatch, tag: str, branches: list[str]) -> None:
+    mock_git = mocker.patch("run_release.git")
+    db = {"release": Tag(tag), "git_repo": Path("/path/to/cpython")}
+
+    with fake_answers(monkeypatch, ["yes", "yes"]):
+        run_release.push_to_upstream(cast(ReleaseShelf, db))
+
+    upstream = "git@github.com:python/cpython.git"
+    assert mock_git.call_args_list == [
+        mocker.call(
+            db["git_repo"],
+            "push",
+            "--dry-run",
+            "--atomic",
+            "--no-verify",
+            "--tags",
+            upstream,
+            *branches,
+        ),
+        mocker.call(
+            db["git_repo"],
+            "push",
+            "--atomic",
+            "--no-verify",
+            "--tags",
+            upstream,
+            *branches,
+        ),
+    ]
+
+
+def test_gpg_tasks_skipped_without_gpg_signing(mocker) -> None:
+    mock_gpg = mocker.patch("run_release.gnupg.GPG")
+    mock_check_call = mocker.patch("run_release.subprocess.check_call")
+    db = {"release": Tag("3.14.0"), "sign_gpg": False}
+
+    run_release.check_gpg_keys(cast(ReleaseShelf, db))
+    run_release.sign_source_artifacts(cast(ReleaseShelf, db))
+
+    mock_gpg.assert_not_called()
+    mock_check_call.assert_not_called()
+
+
+def test_check_gpg_keys_reuses_selected_key(mocker) -> None:
+    mock_gpg = mocker.patch("run_release.gnupg.GPG")
+    mocker.patch.dict(run_release.os.environ)
+    db = {"release": Tag("3.13.0"), "sign_gpg": True, "gpg_key": "ABCD1234"}
+
+    run_release.check_gpg_keys(cast(ReleaseShelf, db))
+
+    mock_gpg.assert_not_called()
+    assert run_release.os.environ["GPG_KEY_FOR_RELEASE"] == "ABCD1234"
+
+
+def test_wait_for_source_and_docs_artifacts(mocker, tmp_path: Path) -> None:
+    src = tmp_path / "3.13.0a1" / "src"
+
+    def fake_sleep(delay: float) -> None:
+        (src / "Python-3.13.0a1.tar.xz").touch()
+
+    src.mkdir(parents=True)
+    (src / "Python-3.13.0a1.tgz").touch()
+    mocker.patch("run_release.time.sleep", fake_sleep)
+    mock_scandir = mocker.patch("run_release.os.scandir", wraps=run_release.os.scandir)
+    db = {"release": Tag("3.13.0a1"), "git_repo": tmp_path}
+
+    run_release.wait_for_source_and_docs_artifacts(cast(ReleaseShelf, db))
+
+    # One listing of the source directory per tick.
+    assert mock_scandir.call_args_list == [mocker.call(src), mocker.call(src)]
+
+
+def test_get_ssh_client_reuses_connection(mocker) -> None:
+    mocker.patch.object(run_release, "_ssh_clients", {})
+    mock_ssh_client = mocker.patch("run_release.paramiko.SSHClient")
+    transport = mock_ssh_client.return_value.get_transport.return_value
+    transport.is_active.return_value = True
+    transport.sock = mocker.Mock(spec=run_release.socket.socket)
+
+    client = run_release.get_ssh_client("downloads.nyc1.psf.io", "user")
+    assert run_release.get_ssh_client("downloads.nyc1.psf.io", "user") is client
+    mock_ssh_client.return_value.connect.assert_called_once_with(
+        "downloads.nyc1.psf.io", port=22, username="user"
+    )
+    transport.set_keepalive.assert_called_once_with(30)
+    transport.sock.setsockopt.assert_called_once_with(
+        run_release.socket.IPPROTO_TCP, run_release.socket.TCP_NODELAY, 1
+    )
+
+    # A dropped connection is replaced by a new one.
+    transport.is_active.return_value = False
+    run_release.get_ssh_client("downloads.nyc1.psf.io", "user")
+    assert mock_ssh_client.return_value.connect.call_count == 2
+
+
+def test_check_ssh_connection_connects_to_both_servers(mocker) -> None:
+    mock_get_ssh_client = mocker.patch("run_release.get_ssh_client")
+    db = {"ssh_user": "user"}
+
+    run_release.check_ssh_connection(cast(ReleaseShelf, db))
+
+    assert sorted(call.args for call in mock_get_ssh_client.call_args_list) == [
+        ("docs.nyc1.psf.io", "user"),
+        ("downloads.nyc1.psf.io", "user"),
+    ]
+    mock_get_ssh_client.return_value.exec_command.assert_not_called()
+
+
+def test_check_ssh_connection_fails(mocker) -> None:
+    mocker.patch(
+        "run_release.get_ssh_client",
+        side_effect=run_release.paramiko.AuthenticationException("denied"),
+    )
+
+    with pytest.raises(run_release.paramiko.AuthenticationException):
+        run_release.check_ssh_connection(cast(ReleaseShelf, {"ssh_user": "user"}))
+
+
+def test_place_files_in_download_folder(mocker) -> None:
+    mocker.patch("run_release.get_ssh_client")
+    mock_execute_commands = mocker.patch("run_release.execute_commands")
+    db = {"release": Tag("3.13.0rc1"), "ssh_user": "user"}
+
+    run_release.place_files_in_download_folder(cast(ReleaseShelf, db))
+
+    # Sources and docs are placed in a single remote shell.
+    mock_execute_commands.assert_called_once()
+    commands = mock_execute_commands.call_args.args[1]
+    assert "mkdir -p /srv/www.python.org/ftp/python/3.13.0" in commands
+    assert "mkdir -p /srv/www.python.org/ftp/python/doc/3.13.0rc1" in commands
+
+
+def test_execute_commands(mocker) -> None:
+    client = mocker.Mock()
+    channel = client.get_transport.return_value.open_session.return_value
+    channel.recv_exit_status.return_value = 0
+
+    run_release.execute_commands(client, ["mkdir -p /srv/a", "chmod 775 /srv/a"])
+
+    channel.exec_command.assert_called_once_with(
+        "set -e; mkdir -p /srv/a; chmod 775 /srv/a"
+    )
+
+    channel.recv_exit_status.return_value = 1
+    channel.recv_stderr.return_value = b"chmod: Operation not permitted"
+    with pytest.raises(run_release.ReleaseException):
+        run_release.execute_commands(client, ["chmod 775 /srv/a"])
+
+
+def test_sign_source_artifacts_in_parallel(mocker, monkeypatch) -> None:
+    monkeypatch.setenv("GPG_KEY_FOR_RELEASE", "ABCDEF")
+    mock_run = mocker.patch("run_release.subprocess.run")
+    mock_popen = mocker.patch("run_release.subprocess.Popen")
+    mock_popen.return_value.wait.return_value = 0
+    mock_check_call = mocker.patch("run_release.subprocess.check_call")
+    mocker.patch("run_release.get_sigstore_token", return_value="token")
+    db = {
+        "release": Tag("3.13.0"),
+        "sign_gpg": True,
+        "git_repo": Path("/path/to/cpython"),
+    }
+
+    run_release.sign_source_artifacts(cast(ReleaseShelf, db))
+
+    # The key is unlocked once before all signatures are started together.
+    assert mock_run.call_count == 1
+    mock_check_call.assert_not_called()
+    src = "/path/to/cpython/3.13.0/src"
+    assert [call.args[0][:3] for call in mock_popen.call_args_list] == [
+        ["gpg", "-bas", "-u"],
+        ["gpg", "-bas", "-u"],
+        ["python3", "-m", "sigstore"],
+        ["python3", "-m", "sigstore"],
+    ]
+    assert [call.args[0][-1] for call in mock_popen.call_args_list] == [
+        f"{src}/Python-3.13.0.tgz",
+        f"{src}/Python-3.13.0.tar.xz",
+    ] * 2
+    assert mock_popen.call_args_list[2].kwargs["env"]["SIGSTORE_IDENTITY_TOKEN"] == (
+        "token"
+    )
+    assert mock_popen.return_value.wait.call_count == 4
+
+
+def _fake_jwt(exp: float) -> str:
+    payload = run_release.base64.urlsafe_b64encode(
+        run_release.json.dumps({"exp": exp}).encode()
+    )
+    return f"header.{payload.decode().rstrip('=')}.signature"
+
+
+@pytest.mark.parametrize(
+    ["cached", "reused"],
+    [
+        (_fake_jwt(run_release.time.time() + 600), True),
+        (_fake_jwt(run_release.time.time() + 30), False),
+        ("not-a-jwt", False),
+        ("header.!!!.signature", False),
+    ],
+)
+def test_get_sigstore_token(mocker, cached: str, reused: bool) -> None:
+    mock_issuer = mocker.patch("run_release.sigstore.oidc.Issuer")
+    mock_issuer.return_value.identity_token.return_value = "new-token"
+    mocker.patch("run_release._sigstore_token", cached)
+
+    token = run_release.get_sigstore_token()
+
+    assert token == (cached if reused else "new-token")
+    assert run_release._sigstore_token == token
+
+
+def test_sqlite_shelf(tmp_path: Path) -> None:
+    shelf = run_release.SqliteShelf(tmp_path / "release.sqlite3")
+    shelf["release"] = Tag("3.13.0")
+    shelf["completed_tasks"] = 3
+    shelf["completed_tasks"] = 4
+    shelf.close()
+
+    shelf = run_release.SqliteShelf(tmp_path / "release.sqlite3")
+    assert str(shelf["release"]) == "3.13.0"
+    assert shelf.get("completed_tasks") == 4
+    assert shelf.get("gpg_key", "default") == "default"
+    with pytest.raises(KeyError):
+        shelf["gpg_key"]
+
+    release = shelf["release"]
+    assert shelf["release"] is release
+
+    shelf.clear()
+    assert shelf.get("release") is None
+    shelf.close()
+
+
+@pytest.mark.parametrize(
+    ["state", "unfinished"],
+    [(None, False), ({"finished": True}, False), ({"finished": False}, True)],
+)
+def test_check_legacy_state_file(
+    tmp_path: Path, state: dict[str, bool] | None, unfinished: bool
+) -> None:
+    path = tmp_path / ".python_release"
+    if state is not None:
+        with run_release.shelve.open(str(path), "c") as legacy:
+            legacy.update(state)
+
+    if unfinished:
+        with pytest.raises(run_release.ReleaseException, match="unfinished release"):
+            run_release.check_legacy_state_file(path)
+    else:
+        run_release.check_legacy_state_file(path)
+
+
+def test_sqlite_shelf_transaction(tmp_path: Path) -> None:
+    shelf = run_release.SqliteShelf(tmp_path / "release.sqlite3")
+    with shelf.transaction():
+        shelf["ssh_user"] = "user"
+        shelf["sign_gpg"] = True
+    with pytest.raises(RuntimeError), shelf.transaction():
+        shelf["ssh_user"] = "other"
+        raise RuntimeError
+    assert shelf["ssh_user"] == "user"
+    shelf.close()
+
+    shelf = run_release.SqliteShelf(tmp_path / "release.sqlite3")
+    assert shelf["ssh_user"] == "user"
+    assert shelf["sign_gpg"] is True
+    shelf.close()